@@ -6,18 +6,42 @@ This file demonstrates the Qwen AI Nexus implementation as described in the proj
 """
 import sys
 import os
+import json
+import logging
+import argparse
+from src import ai_nexus
 from src.ai_nexus import QwenNexus
 
 
 def main():
-    print("="*60)
-    print("SocraTask - The Sovereign Productivity & Education Ecosystem")
-    print("Qwen AI Nexus - Local Intelligence Core")
-    print("="*60)
+    parser = argparse.ArgumentParser(description="SocraTask Qwen AI Nexus")
+    parser.add_argument("--redo-diagnostic", action="store_true",
+                        help="ignore the cached Performance Blueprint and re-run the hardware diagnostic")
+    args = parser.parse_args()
     
-    print("\nInitializing the Qwen AI Nexus...")
-    print("This will perform a comprehensive 90-second hardware diagnostic")
-    print("to build a 'Performance Blueprint' of your device.\n")
+    # Nexus progress is logged rather than printed; show it on stdout in line
+    # with the report, while keeping third-party libraries at WARNING
+    logging.basicConfig(level=logging.WARNING, format="%(message)s", stream=sys.stdout)
+    logging.getLogger(ai_nexus.__name__).setLevel(logging.INFO)
+    
+    # Report sections are collected here and written with a single call each,
+    # rather than one console write per line
+    out = []
+    
+    def emit():
+        sys.stdout.write("\n".join(out) + "\n")
+        sys.stdout.flush()
+        out.clear()
+    
+    out.append("="*60)
+    out.append("SocraTask - The Sovereign Productivity & Education Ecosystem")
+    out.append("Qwen AI Nexus - Local Intelligence Core")
+    out.append("="*60)
+    
+    out.append("\nInitializing the Qwen AI Nexus...")
+    out.append("On first run (or with --redo-diagnostic) this performs a comprehensive")
+    out.append("90-second hardware diagnostic to build a 'Performance Blueprint' of your device.\n")
+    emit()
     
     # Create the Qwen Nexus instance
     nexus = QwenNexus(models_dir="./models")
@@ -29,68 +53,73 @@ def main():
     try:
         # Initialize the nexus
         print("Starting hardware diagnostic and AI Nexus initialization...\n")
-        nexus.initialize(progress_callback=progress_callback)
+        nexus.initialize(progress_callback=progress_callback, redo_diagnostic=args.redo_diagnostic)
         
-        print("\n" + "="*60)
-        print("DIAGNOSTIC COMPLETE!")
-        print("="*60)
+        out.append("\n" + "="*60)
+        out.append("DIAGNOSTIC COMPLETE!")
+        out.append("="*60)
         
         # Get hardware profile
         hw_profile = nexus.get_hardware_profile()
-        print(f"\nHardware Profile Detected:")
-        print(f"  Architecture: {hw_profile.architecture}")
-        print(f"  CPU Cores: {hw_profile.cpu_cores}")
-        print(f"  CPU Threads: {hw_profile.cpu_threads}")
-        print(f"  CPU Speed: {hw_profile.cpu_speed:.2f} GHz")
-        print(f"  RAM: {hw_profile.ram_gb} GB")
-        print(f"  GPU: {hw_profile.gpu_name or 'None'} ({hw_profile.gpu_vram_gb or 0} GB VRAM)")
-        print(f"  Storage Tier: {hw_profile.storage_tier}")
-        print(f"  Thermal Profile: {hw_profile.thermal_profile}")
-        print(f"  Special Instructions: {', '.join(hw_profile.special_instructions or ['None'])}")
+        out.append(f"\nHardware Profile Detected:")
+        out.append(f"  Architecture: {hw_profile.architecture}")
+        out.append(f"  CPU Cores: {hw_profile.cpu_cores}")
+        out.append(f"  CPU Threads: {hw_profile.cpu_threads}")
+        out.append(f"  CPU Speed: {hw_profile.cpu_speed:.2f} GHz")
+        if hw_profile.cpu_speed_sustained:
+            out.append(f"  Sustained CPU Speed: {hw_profile.cpu_speed_sustained:.2f} GHz")
+        out.append(f"  RAM: {hw_profile.ram_gb} GB")
+        out.append(f"  GPU: {hw_profile.gpu_name or 'None'} ({hw_profile.gpu_vram_gb or 0} GB VRAM)")
+        out.append(f"  Storage Tier: {hw_profile.storage_tier}")
+        out.append(f"  Thermal Profile: {hw_profile.thermal_profile}")
+        out.append(f"  Special Instructions: {', '.join(hw_profile.special_instructions or ['None'])}")
         
         # Get model recommendations
         recommendations = nexus.get_model_recommendations()
-        print(f"\nModel Recommendations Based on Your Hardware:")
+        out.append(f"\nModel Recommendations Based on Your Hardware:")
         
         primary_model = recommendations['primary_model']
         if primary_model:
-            print(f"  Primary Model: {primary_model.name}")
-            print(f"    Size: {primary_model.size}, Quantization: {primary_model.quantization}")
-            print(f"    Disk Size: {primary_model.disk_size_gb} GB")
-            print(f"    RAM Requirement: {primary_model.ram_requirement_gb} GB")
-            print(f"    Description: {primary_model.description}")
+            out.append(f"  Primary Model: {primary_model.name}")
+            out.append(f"    Size: {primary_model.size}, Quantization: {primary_model.quantization}")
+            out.append(f"    Disk Size: {primary_model.disk_size_gb} GB")
+            out.append(f"    RAM Requirement: {primary_model.ram_requirement_gb} GB")
+            out.append(f"    Description: {primary_model.description}")
         
-        print(f"\nAI Profiles Available:")
+        out.append(f"\nAI Profiles Available:")
         for profile_name, profile_data in recommendations['profiles'].items():
-            print(f"  {profile_data['name']}:")
-            print(f"    Description: {profile_data['description']}")
+            out.append(f"  {profile_data['name']}:")
+            out.append(f"    Description: {profile_data['description']}")
             if 'recommended_model' in profile_data:
-                print(f"    Recommended Model: {profile_data['recommended_model']}")
+                out.append(f"    Recommended Model: {profile_data['recommended_model']}")
             elif 'recommended_models' in profile_data:
-                print(f"    Recommended Models: {', '.join(profile_data['recommended_models'])}")
-            print(f"    Configuration: {profile_data['configuration']}")
-            print()
+                out.append(f"    Recommended Models: {', '.join(profile_data['recommended_models'])}")
+            # Profiles are read-only mappings; show them as plain JSON
+            out.append(f"    Configuration: {json.dumps(profile_data['configuration'], default=dict)}")
+            out.append("")
         
         # Show system status
         status = nexus.get_system_status()
-        print(f"System Status:")
-        print(f"  Initialized: {status['initialized']}")
-        print(f"  Privacy Mode: {status['privacy_mode']}")
-        print(f"  Sandboxed Execution: {status['sandboxed_execution']}")
-        print(f"  Downloaded Models: {status['downloaded_models_count']}")
-        print(f"  Active Models: {status['active_models_count']}")
-        print(f"  Orchestration Rules: {status['orchestration_rules_count']}")
-        print(f"  Trusted Models: {status['trust_store_size']}")
+        out.append(f"System Status:")
+        out.append(f"  Initialized: {status['initialized']}")
+        out.append(f"  Privacy Mode: {status['privacy_mode']}")
+        out.append(f"  Sandboxed Execution: {status['sandboxed_execution']}")
+        out.append(f"  Downloaded Models: {status['downloaded_models_count']}")
+        out.append(f"  Active Models: {status['active_models_count']}")
+        out.append(f"  Orchestration Rules: {status['orchestration_rules_count']}")
+        out.append(f"  Trusted Models: {status['trust_store_size']}")
         
         # Run privacy audit
         audit = nexus.run_privacy_audit()
-        print(f"\nPrivacy Audit:")
+        out.append(f"\nPrivacy Audit:")
         for check, result in audit.items():
             status_str = "✓" if result else "✗"
-            print(f"  {status_str} {check.replace('_', ' ').title()}: {result}")
+            out.append(f"  {status_str} {check.replace('_', ' ').title()}: {result}")
         
         # Demonstrate task execution
-        print(f"\nDemonstrating Task Execution:")
+        out.append(f"\nDemonstrating Task Execution:")
+        # Flush the report before the demo, which logs as it executes
+        emit()
         tasks = [
             ("writing", "Write a short poem about productivity"),
             ("coding", "Explain how to reverse a linked list in Python"),
@@ -99,16 +128,18 @@ def main():
         
         for task_type, query in tasks:
             response = nexus.execute_task(task_type, query)
-            print(f"  {task_type.title()} Task: {response}")
+            out.append(f"  {task_type.title()} Task: {response}")
         
-        print(f"\n" + "="*60)
-        print("QWEN AI NEXUS READY!")
-        print("Your local intelligence core is now configured and operational.")
-        print("All processing occurs locally on your device - your data remains sovereign.")
-        print("="*60)
+        out.append(f"\n" + "="*60)
+        out.append("QWEN AI NEXUS READY!")
+        out.append("Your local intelligence core is now configured and operational.")
+        out.append("All processing occurs locally on your device - your data remains sovereign.")
+        out.append("="*60)
+        emit()
         
     except Exception as e:
-        print(f"Error during initialization: {str(e)}")
+        out.append(f"Error during initialization: {str(e)}")
+        emit()
         sys.exit(1)
 
 
@@ -1,8 +1,13 @@
 """
 SocraTask AI Nexus - Local Intelligence Core
 """
+import logging
+
 from .hardware_profiler import HardwareProfiler
 from .model_manager import ModelManager
 from .nexus_core import QwenNexus
 
-__all__ = ['HardwareProfiler', 'ModelManager', 'QwenNexus']
\ No newline at end of file
+__all__ = ['HardwareProfiler', 'ModelManager', 'QwenNexus']
+
+# Library logging is silent unless the application configures a handler
+logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -5,93 +5,278 @@ Implements the 90-second diagnostic process to build a "Performance Blueprint"
 of the host device, including hardware census, thermal characterization, and
 baseline AI benchmarking.
 """
+import os
+import json
 import time
-import psutil
-import cpuinfo
+import hashlib
+import shutil
 import platform
 import subprocess
 import threading
-from dataclasses import dataclass
-from typing import Dict, Any, Optional
-import GPUtil
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Mapping, Optional
+from .perf_counters import PerfCounters
 
 
-@dataclass
+# CPU feature flags (as reported by cpuinfo) mapped to the instruction set they
+# advertise. These gate which quantized llama.cpp/ggml kernels can be used.
+SPECIAL_INSTRUCTION_FLAGS = (
+    (('avx',), 'AVX'),
+    (('avx2',), 'AVX2'),
+    (('avx512f',), 'AVX-512'),
+    (('avx_vnni', 'avxvnni'), 'AVX-VNNI'),
+    (('amx_tile',), 'AMX-TILE'),
+    (('amx_int8',), 'AMX-INT8'),
+    (('sha_ni', 'sha'), 'SHA-NI'),
+    (('vpclmulqdq',), 'VPCLMULQDQ'),
+    (('gfni',), 'GFNI'),
+    (('neon', 'asimd'), 'NEON'),
+)
+
+# sysfs file exposing the CPU package temperature in millidegrees Celsius
+LINUX_THERMAL_ZONE = '/sys/class/thermal/thermal_zone0/temp'
+
+# How long past its nominal duration the thermal monitor waits for the load
+# test (which also samples the sustained clock) before giving up on it
+LOAD_TEST_GRACE_SECONDS = 10.0
+
+# Hardware counters sampled around the stage 3 inference probe
+BENCHMARK_COUNTERS = (
+    'cycles', 'instructions',
+    'cache_references', 'cache_misses',
+    'l1d_read_accesses', 'l1d_read_misses',
+)
+
+# Overall score model: each feature is "lower is better" and maps to a
+# 0-100 sub-score as clip(100 - feature * scale). Features, in order:
+#   latency (ms/token), RSS overhead beyond the touched buffer (fraction),
+#   slowdown under contention (fraction), cycles per instruction, LLC miss
+#   rate (%)
+SCORE_SCALES = (0.1, 100.0, 100.0, 25.0, 1.0)
+SCORE_WEIGHTS = (0.3, 0.2, 0.2, 0.15, 0.15)
+
+
+@dataclass(frozen=True, slots=True)
 class HardwareCapabilityVector:
-    """Data structure representing the hardware capabilities"""
+    """Data structure representing the hardware capabilities (immutable and hashable)"""
     architecture: str
     cpu_cores: int
     cpu_threads: int
-    cpu_speed: float  # GHz
+    cpu_speed: float  # GHz, nominal maximum
     ram_gb: float
     gpu_name: Optional[str] = None
     gpu_vram_gb: Optional[float] = None
     storage_tier: str = "Unknown"
     thermal_profile: str = "Unknown"
-    special_instructions: list = None
+    special_instructions: tuple = ()
+    cpu_speed_sustained: Optional[float] = None  # GHz, measured under load
+
+
+@functools.lru_cache(maxsize=4)
+def _recommendations_for(capability_vector: HardwareCapabilityVector) -> Mapping[str, Any]:
+    """Read-only recommendations for a capability vector, shared by all profilers"""
+    recommendations = {}
+    
+    # Determine recommended model based on hardware specs
+    if capability_vector.ram_gb >= 32 and capability_vector.gpu_vram_gb and capability_vector.gpu_vram_gb >= 8:
+        recommendations['primary_model'] = 'Qwen2.5-32B (Q8_0)'
+        recommendations['gpu_layers'] = 'All layers'
+        recommendations['strategy'] = 'Power User - Full GPU acceleration'
+    elif capability_vector.ram_gb >= 16 and capability_vector.gpu_vram_gb and capability_vector.gpu_vram_gb >= 4:
+        recommendations['primary_model'] = 'Qwen2.5-7B (Q6_K)'
+        recommendations['gpu_layers'] = '20-30 layers'
+        recommendations['strategy'] = 'Balanced Performance'
+    elif capability_vector.ram_gb >= 8:
+        recommendations['primary_model'] = 'Qwen2.5-1.5B (Q4_K_M)'
+        recommendations['gpu_layers'] = '5-10 layers if GPU available'
+        recommendations['strategy'] = 'Efficient Operation'
+    else:
+        recommendations['primary_model'] = 'Qwen2.5-0.5B (IQ4_XS)'
+        recommendations['gpu_layers'] = 'None (CPU only)'
+        recommendations['strategy'] = 'Minimal Resource Usage'
+    
+    # Generate AI profiles
+    profiles = {
+        'balanced_daily_driver': f"Qwen2.5-7B (Q6_K) for all tasks",
+        'specialist_ensemble': "Multiple smaller models (Coder, Math, General) with automatic routing",
+        'speed_demon': "Tiny model (0.5B) for instant responses, with option for larger models",
+        'power_user_config': "Manual control for advanced users"
+    }
+    recommendations['profiles'] = MappingProxyType(profiles)
+    
+    return MappingProxyType(recommendations)
 
 
 class HardwareProfiler:
     """Comprehensive hardware profiling engine"""
     
-    def __init__(self):
+    # Cached blueprints older than this are re-measured
+    BLUEPRINT_MAX_AGE_DAYS = 30
+    
+    def __init__(self, blueprint_path: Optional[str] = None):
         self.capability_vector = None
         self.profiles = {}
+        self.blueprint_path = Path(blueprint_path) if blueprint_path else Path.home() / '.socratask' / 'blueprint.json'
+        self._cpu_info = None
+        # Long-lived descriptor for the Linux thermal zone, see _probe_temp_source
+        self._thermal_fd = None
+        # Resolve the temperature sensor once; polling a missing one is wasted work
+        self._temp_source = self._probe_temp_source()
+    
+    def close(self) -> None:
+        """Release the thermal sensor descriptor"""
+        if getattr(self, '_thermal_fd', None) is not None:
+            os.close(self._thermal_fd)
+            self._thermal_fd = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __del__(self):
+        self.close()
         
-    def run_full_diagnostic(self, progress_callback=None) -> HardwareCapabilityVector:
+    def run_full_diagnostic(self, progress_callback=None, use_cache: bool = True) -> HardwareCapabilityVector:
         """
-        Run the complete 90-second diagnostic process
+        Run the complete 90-second diagnostic process.
+        
+        The resulting Performance Blueprint is cached per hardware signature;
+        unless use_cache is False, a fresh cached blueprint for this machine
+        is returned immediately instead of re-running the diagnostic.
         """
+        signature = self._blueprint_signature()
+        if use_cache:
+            cached = self._load_blueprint(signature)
+            if cached:
+                print("Using cached Performance Blueprint")
+                if progress_callback:
+                    progress_callback(90, "Loaded cached performance blueprint")
+                self.capability_vector = cached
+                return self.capability_vector
+        
         print("Starting SocraTask Hardware Diagnostic...")
         
-        # Stage 1: Hardware Census (0-30 seconds)
-        print("Stage 1: Hardware Census")
-        hardware_data = self._hardware_census()
+        # Probing libraries are imported on first use so that importing the
+        # nexus (e.g. for the CLI banner) does not pay for them
+        import cpuinfo
+        
+        # cpuid probing is slow, so query it once and share the result
+        self._cpu_info = cpuinfo.get_cpu_info()
+        
+        # The census is mostly subprocess and sysfs latency, so it runs in the
+        # background while the thermal load test occupies the CPU
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Stage 1: Hardware Census (0-30 seconds)
+            print("Stage 1: Hardware Census")
+            census_future = executor.submit(self._hardware_census, self._cpu_info)
+            
+            # Stage 2: Thermal & Power Characterization (31-60 seconds)
+            print("Stage 2: Thermal & Power Characterization")
+            thermal_data = self._thermal_characterization()
+            
+            hardware_data = census_future.result()
         if progress_callback:
             progress_callback(30, "Hardware census complete")
-        
-        # Stage 2: Thermal & Power Characterization (31-60 seconds)
-        print("Stage 2: Thermal & Power Characterization")
-        thermal_data = self._thermal_characterization()
-        if progress_callback:
             progress_callback(60, "Thermal characterization complete")
         
         # Stage 3: Baseline AI Benchmarking (61-90 seconds)
+        # Runs after the load test so it is not skewed by it
         print("Stage 3: Baseline AI Benchmarking")
-        benchmark_data = self._baseline_ai_benchmarking()
+        benchmark_data = self._baseline_ai_benchmarking(hardware_data['ram_gb'])
         if progress_callback:
             progress_callback(90, "Benchmarking complete")
         
         # Combine all data into capability vector
         self.capability_vector = self._create_capability_vector(hardware_data, thermal_data, benchmark_data)
+        self._save_blueprint(signature, self.capability_vector)
         
         print("Diagnostic complete!")
         return self.capability_vector
     
-    def _hardware_census(self) -> Dict[str, Any]:
+    def _blueprint_signature(self) -> str:
+        """Hash the cheaply observable hardware identity used to key cached blueprints"""
+        import psutil
+        gpus = self._enumerate_gpus()
+        identity = '|'.join([
+            self._cpu_model_name(),
+            str(psutil.virtual_memory().total),
+            gpus[0]['name'] if gpus else '',
+            platform.system(),
+            platform.release(),
+        ])
+        return hashlib.sha256(identity.encode()).hexdigest()
+    
+    def _cpu_model_name(self) -> str:
+        """CPU model string, read without the (slow) cpuinfo probe"""
+        if platform.system() == 'Linux':
+            try:
+                with open('/proc/cpuinfo', 'r') as f:
+                    for line in f:
+                        if line.startswith('model name'):
+                            return line.split(':', 1)[1].strip()
+            except OSError:
+                pass
+        return f"{platform.processor()} x{os.cpu_count()}"
+    
+    def _load_blueprint(self, signature: str) -> Optional[HardwareCapabilityVector]:
+        """Return the cached capability vector for this signature, if present and fresh"""
+        try:
+            with open(self.blueprint_path, 'r') as f:
+                entry = json.load(f).get(signature)
+            if not entry or time.time() - entry['created'] > self.BLUEPRINT_MAX_AGE_DAYS * 86400:
+                return None
+            vector = entry['vector']
+            vector['special_instructions'] = tuple(vector.get('special_instructions', ()))
+            return HardwareCapabilityVector(**vector)
+        except (OSError, ValueError, TypeError, KeyError):
+            # Missing, corrupt, or written by an incompatible version
+            return None
+    
+    def _save_blueprint(self, signature: str, vector: HardwareCapabilityVector) -> None:
+        """Store the capability vector under its hardware signature"""
+        try:
+            with open(self.blueprint_path, 'r') as f:
+                blueprints = json.load(f)
+        except (OSError, ValueError):
+            blueprints = {}
+        blueprints[signature] = {'created': time.time(), 'vector': asdict(vector)}
+        try:
+            self.blueprint_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.blueprint_path, 'w') as f:
+                json.dump(blueprints, f, indent=2)
+        except OSError as e:
+            print(f"Could not save Performance Blueprint: {e}")
+    
+    def _hardware_census(self, cpu_info: Dict[str, Any]) -> Dict[str, Any]:
         """Stage 1: Comprehensive hardware analysis"""
+        import psutil
         census_data = {}
         
         # Processor interrogation
-        cpu_info = cpuinfo.get_cpu_info()
         census_data['cpu_architecture'] = platform.machine()
         census_data['cpu_vendor'] = cpu_info.get('vendor_id_raw', 'Unknown')
         census_data['cpu_model'] = cpu_info.get('brand_raw', 'Unknown')
         census_data['cpu_cores'] = psutil.cpu_count(logical=False)
         census_data['cpu_threads'] = psutil.cpu_count(logical=True)
         census_data['cpu_max_freq'] = psutil.cpu_freq().max / 1000.0  # GHz
-        census_data['special_instructions'] = self._detect_special_instructions()
+        census_data['special_instructions'] = self._detect_special_instructions(cpu_info)
         
         # Memory mapping
         memory = psutil.virtual_memory()
         census_data['ram_gb'] = round(memory.total / (1024**3), 2)
         
         # GPU identification
-        gpus = GPUtil.getGPUs()
+        gpus = self._enumerate_gpus()
         if gpus:
             gpu = gpus[0]  # Primary GPU
-            census_data['gpu_name'] = gpu.name
-            census_data['gpu_vram_gb'] = round(gpu.memoryTotal / 1024.0, 2)  # Convert MB to GB
+            census_data['gpu_name'] = gpu['name']
+            census_data['gpu_vram_gb'] = gpu['vram_gb']
             census_data['gpu_driver'] = self._get_gpu_driver()
         else:
             census_data['gpu_name'] = None
@@ -101,26 +286,23 @@ class HardwareProfiler:
         disk_usage = psutil.disk_usage('/')
         census_data['storage_total_gb'] = round(disk_usage.total / (1024**3), 2)
         census_data['storage_free_gb'] = round(disk_usage.free / (1024**3), 2)
-        census_data['storage_tier'] = self._assess_storage_tier()
+        storage_devices = self._storage_block_devices()
+        census_data['storage_devices'] = storage_devices
+        census_data['storage_model'] = self._read_sysfs_block(storage_devices[0], 'device/model') if storage_devices else None
+        census_data['storage_tier'] = self._assess_storage_tier(storage_devices)
         
         return census_data
     
-    def _detect_special_instructions(self) -> list:
+    def _detect_special_instructions(self, cpu_info: Dict[str, Any]) -> list:
         """Detect specialized CPU instruction sets for accelerated tensor operations"""
         instructions = []
         
-        # This is a simplified detection - in practice, you'd use more specific methods
-        cpu_info = cpuinfo.get_cpu_info()
-        flags = cpu_info.get('flags', [])
+        # Hashed lookups: cpuinfo can report hundreds of flags
+        flags = frozenset(cpu_info.get('flags', ()))
         
-        if 'avx' in flags:
-            instructions.append('AVX')
-        if 'avx2' in flags:
-            instructions.append('AVX2')
-        if 'avx512f' in flags:
-            instructions.append('AVX-512')
-        if 'neon' in flags:
-            instructions.append('NEON')
+        for flag_names, instruction in SPECIAL_INSTRUCTION_FLAGS:
+            if any(flag in flags for flag in flag_names):
+                instructions.append(instruction)
         
         # Additional checks for platform-specific features
         if platform.system() == 'Darwin':  # macOS (Apple Silicon)
@@ -129,43 +311,141 @@ class HardwareProfiler:
         
         return instructions
     
-    def _assess_storage_tier(self) -> str:
-        """Assess storage type (SSD vs HDD) and performance tier"""
-        # Simple heuristic: check if disk is likely an SSD
+    def _storage_block_devices(self) -> list:
+        """List the /sys/block devices backing the root filesystem (Linux only)"""
+        if platform.system() != 'Linux':
+            return []
         try:
-            # On Linux, check rotational status
-            if platform.system() == 'Linux':
-                with open('/sys/block/sda/queue/rotational', 'r') as f:
-                    is_rotational = f.read().strip() == '1'
-                    return 'Slow' if is_rotational else 'Fast'
-            # On other systems, use a basic heuristic based on performance
-            start_time = time.time()
-            # Simple I/O test
-            with open('/tmp/storage_test.tmp', 'wb') as f:
-                f.write(b'0' * 1024 * 1024)  # 1MB
-            write_time = time.time() - start_time
-            return 'Fast' if write_time < 0.1 else 'Slow'
-        except:
+            # Resolve the device holding '/' through its major:minor number
+            root_dev = os.stat('/').st_dev
+            dev_path = f'/sys/dev/block/{os.major(root_dev)}:{os.minor(root_dev)}'
+            if os.path.exists(dev_path):
+                device = os.path.realpath(dev_path)
+                # Partitions have no queue/ of their own; the parent is the disk
+                if not os.path.isdir(os.path.join(device, 'queue')):
+                    device = os.path.dirname(device)
+                return [os.path.basename(device)]
+            
+            # Root is not on a block device (overlayfs, tmpfs, ...): fall back to
+            # every physical disk in the system
+            return sorted(
+                name for name in os.listdir('/sys/block')
+                if not name.startswith(('loop', 'ram', 'zram'))
+            )
+        except OSError:
+            return []
+    
+    def _read_sysfs_block(self, device: str, attribute: str) -> Optional[str]:
+        """Read an attribute of a /sys/block device, or None if unavailable"""
+        try:
+            with open(f'/sys/block/{device}/{attribute}', 'r') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+    
+    def _assess_storage_tier(self, devices: list) -> str:
+        """Assess storage type (SSD vs HDD) and performance tier"""
+        # Rotational flags are only exposed on Linux; a timed write to /tmp
+        # mostly measures the page cache, so other systems report Unknown
+        rotational = []
+        for device in devices:
+            if device.startswith('nvme'):
+                rotational.append(False)
+                continue
+            flag = self._read_sysfs_block(device, 'queue/rotational')
+            if flag is not None:
+                rotational.append(flag == '1')
+        
+        if not rotational:
             return 'Unknown'
+        return 'Slow' if any(rotational) else 'Fast'
+    
+    def _enumerate_gpus(self) -> list:
+        """List available GPUs as dicts with 'name' and 'vram_gb' keys"""
+        # Query vendor libraries directly instead of parsing nvidia-smi output
+        for probe in (self._enumerate_nvml_gpus, self._enumerate_amd_gpus, self._enumerate_metal_gpus):
+            gpus = probe()
+            if gpus:
+                return gpus
+        return []
+    
+    def _enumerate_nvml_gpus(self) -> list:
+        """List NVIDIA GPUs through NVML"""
+        try:
+            import pynvml
+            pynvml.nvmlInit()
+        except Exception:
+            return []
+        try:
+            gpus = []
+            for index in range(pynvml.nvmlDeviceGetCount()):
+                handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+                name = pynvml.nvmlDeviceGetName(handle)
+                gpus.append({
+                    'name': name.decode() if isinstance(name, bytes) else name,
+                    'vram_gb': round(pynvml.nvmlDeviceGetMemoryInfo(handle).total / (1024**3), 2)
+                })
+            return gpus
+        except Exception:
+            return []
+        finally:
+            pynvml.nvmlShutdown()
+    
+    def _enumerate_amd_gpus(self) -> list:
+        """List AMD GPUs through pyamdgpuinfo (Linux amdgpu driver)"""
+        try:
+            import pyamdgpuinfo
+            return [
+                {
+                    'name': gpu.name,
+                    'vram_gb': round(gpu.memory_info['vram_size'] / (1024**3), 2)
+                }
+                for gpu in map(pyamdgpuinfo.get_gpu, range(pyamdgpuinfo.detect_gpus()))
+            ]
+        except Exception:
+            return []
+    
+    def _enumerate_metal_gpus(self) -> list:
+        """Describe the default Metal device on macOS through PyObjC"""
+        if platform.system() != 'Darwin':
+            return []
+        try:
+            import Metal
+            device = Metal.MTLCreateSystemDefaultDevice()
+            if device is None:
+                return []
+            # Apple Silicon shares memory; this is the GPU's usable working set
+            return [{
+                'name': str(device.name()),
+                'vram_gb': round(device.recommendedMaxWorkingSetSize() / (1024**3), 2)
+            }]
+        except Exception:
+            return []
     
     def _get_gpu_driver(self) -> str:
         """Get GPU driver information"""
+        if platform.system() == 'Darwin':  # macOS
+            return "Metal"
+        
+        # NVML covers both Windows and Linux in-process, without forking
+        # nvidia-smi and initialising CUDA
         try:
-            if platform.system() == 'Windows':
-                result = subprocess.run(['nvidia-smi', '--query-gpu=driver_version', '--format=csv,noheader,nounits'], 
-                                      capture_output=True, text=True)
-                return result.stdout.strip() if result.returncode == 0 else "Unknown"
-            elif platform.system() == 'Linux':
-                result = subprocess.run(['nvidia-smi', '--query-gpu=driver_version', '--format=csv,noheader,nounits'], 
-                                      capture_output=True, text=True)
-                return result.stdout.strip() if result.returncode == 0 else "Unknown"
-            elif platform.system() == 'Darwin':  # macOS
-                return "Metal"
-        except:
+            import pynvml
+            pynvml.nvmlInit()
+        except Exception:
+            return "Unknown"
+        try:
+            version = pynvml.nvmlSystemGetDriverVersion()
+            # Older pynvml releases return bytes
+            return version.decode() if isinstance(version, bytes) else version
+        except Exception:
             return "Unknown"
+        finally:
+            pynvml.nvmlShutdown()
     
-    def _thermal_characterization(self) -> Dict[str, Any]:
+    def _thermal_characterization(self, duration: int = 20, poll_interval: float = 0.5) -> Dict[str, Any]:
         """Stage 2: Thermal and power characterization"""
+        import numpy as np
         thermal_data = {}
         
         # Get initial temperature (if available)
@@ -176,34 +456,47 @@ class HardwareProfiler:
         print("Running thermal stress test...")
         start_time = time.time()
         
-        # Simple CPU load test
-        load_test_thread = threading.Thread(target=self._cpu_load_test, args=(20,))
+        # Simple CPU load test; it sets `done` as soon as the load stops
+        done = threading.Event()
+        load_results = {}
+        load_test_thread = threading.Thread(target=self._cpu_load_test, args=(duration, done, load_results))
         load_test_thread.start()
         
-        # Monitor temperature during the test
-        max_temp = initial_temp if initial_temp else 0
-        temp_readings = []
+        # Monitor temperature during the test into a preallocated buffer
+        temps = np.empty(int(duration / poll_interval) + 4, dtype=np.float32)
+        n = 0
         
-        while load_test_thread.is_alive():
+        # Stop polling if the load test dies or overruns without signalling
+        deadline = start_time + duration + LOAD_TEST_GRACE_SECONDS
+        while not done.wait(poll_interval):
+            if not load_test_thread.is_alive() or time.time() > deadline:
+                break
             current_temp = self._get_system_temperature()
-            if current_temp and current_temp > max_temp:
-                max_temp = current_temp
-            if current_temp:
-                temp_readings.append(current_temp)
-            time.sleep(1)
+            if current_temp and n < len(temps):
+                temps[n] = current_temp
+                n += 1
+        done.set()
+        load_test_thread.join()
         
         end_time = time.time()
+        temp_readings = temps[:n]
+        baseline = initial_temp or 0
         thermal_data['test_duration'] = end_time - start_time
-        thermal_data['max_temp'] = max_temp
-        thermal_data['temp_delta'] = max_temp - (initial_temp or 0)
+        thermal_data['max_temp'] = max(float(temp_readings.max()), baseline) if n else baseline
+        thermal_data['temp_p95'] = float(np.percentile(temp_readings, 95)) if n else baseline
+        thermal_data['temp_std'] = float(temp_readings.std()) if n else 0.0
+        thermal_data['temp_delta'] = thermal_data['max_temp'] - baseline
         thermal_data['temp_readings'] = temp_readings
+        thermal_data['cpu_sustained_ghz'] = load_results.get('cpu_sustained_ghz')
         
-        # Assess thermal profile based on results
-        if thermal_data['temp_delta'] < 10:
+        # Assess thermal profile from the 95th percentile so that a single
+        # sensor spike does not push the device into a worse bucket
+        sustained_delta = thermal_data['temp_p95'] - baseline
+        if sustained_delta < 10:
             thermal_profile = "Excellent"
-        elif thermal_data['temp_delta'] < 20:
+        elif sustained_delta < 20:
             thermal_profile = "Good"
-        elif thermal_data['temp_delta'] < 30:
+        elif sustained_delta < 30:
             thermal_profile = "Balanced"
         else:
             thermal_profile = "Limited"
@@ -214,37 +507,123 @@ class HardwareProfiler:
     
     def _get_system_temperature(self) -> Optional[float]:
         """Get system temperature if available"""
+        if self._temp_source is None:
+            return None
         try:
-            # Different systems have different temperature sources
-            if platform.system() == 'Linux':
-                # Try to get CPU temperature from common sensors
-                import os
-                if os.path.exists('/sys/class/thermal/thermal_zone0/temp'):
-                    with open('/sys/class/thermal/thermal_zone0/temp', 'r') as f:
-                        temp = float(f.read().strip()) / 1000.0
-                        return temp
-            elif platform.system() == 'Darwin':  # macOS
-                # Use 'sensors' command if available (requires installation)
-                result = subprocess.run(['osx-cpu-temp'], capture_output=True, text=True)
-                if result.returncode == 0:
-                    temp_str = result.stdout.strip().replace('°C', '')
-                    return float(temp_str)
-            elif platform.system() == 'Windows':
-                # Windows temperature detection is complex and may require WMI or other tools
-                pass
+            return self._temp_source()
         except:
-            pass  # Return None if temperature detection fails
+            return None  # Return None if temperature detection fails
+    
+    def _probe_temp_source(self):
+        """Find a working temperature reader for this system, or None"""
+        # Different systems have different temperature sources
+        if platform.system() == 'Linux':
+            # Try to get CPU temperature from common sensors. The file stays
+            # open so each sample is a single pread() instead of open/read/close
+            try:
+                self._thermal_fd = os.open(LINUX_THERMAL_ZONE, os.O_RDONLY)
+            except OSError:
+                return None
+            reader = self._read_linux_thermal_zone
+        elif platform.system() == 'Darwin':  # macOS
+            # Use 'osx-cpu-temp' command if available (requires installation)
+            if shutil.which('osx-cpu-temp'):
+                reader = self._read_osx_cpu_temp
+            else:
+                return None
+        else:
+            # Windows temperature detection is complex and may require WMI or other tools
+            return None
+        
+        # Keep the reader only if it actually produces a value
+        try:
+            if reader() is not None:
+                return reader
+        except:
+            pass
+        self.close()
         return None
     
-    def _cpu_load_test(self, duration: int):
-        """Run a CPU load test for specified duration"""
+    def _read_linux_thermal_zone(self) -> float:
+        """Read the CPU temperature from the first Linux thermal zone"""
+        return float(os.pread(self._thermal_fd, 16, 0)) / 1000.0
+    
+    def _read_osx_cpu_temp(self) -> Optional[float]:
+        """Read the CPU temperature through the osx-cpu-temp utility"""
+        result = subprocess.run(['osx-cpu-temp'], capture_output=True, text=True)
+        if result.returncode == 0:
+            temp_str = result.stdout.strip().replace('°C', '')
+            return float(temp_str)
+        return None
+    
+    def _cpu_load_test(self, duration: int, done_event: Optional[threading.Event] = None,
+                       results: Optional[Dict[str, Any]] = None):
+        """Run a CPU load test for specified duration, then set done_event (also on failure)"""
+        done_event = done_event or threading.Event()
+        try:
+            self._run_cpu_load(duration, done_event, results)
+        finally:
+            done_event.set()
+    
+    def _run_cpu_load(self, duration: int, done_event: threading.Event, results: Optional[Dict[str, Any]]):
+        """Keep every logical core busy with matmul until duration passes or done_event is set"""
+        import numpy as np
+        import psutil
+        from threadpoolctl import threadpool_limits
+        # BLAS-backed matmul keeps the SIMD units busy, which is the same load
+        # model inference puts on the chip; NumPy releases the GIL inside dot()
+        a = np.random.rand(1024, 1024).astype(np.float32)
+        b = np.random.rand(1024, 1024).astype(np.float32)
         start = time.time()
-        while time.time() - start < duration:
-            # Perform CPU-intensive operation
-            sum(i * i for i in range(1000))
+        
+        def worker(measure_clock: bool = False):
+            out = np.empty_like(a)
+            while not done_event.is_set() and time.time() - start < duration:
+                # Halfway through, when the part is hot, sample the clock it
+                # actually sustains rather than the advertised boost
+                if measure_clock and time.time() - start >= duration / 2:
+                    measure_clock = False
+                    if results is not None:
+                        results['cpu_sustained_ghz'] = self._measure_sustained_ghz(
+                            lambda: np.dot(a, b, out=out)
+                        )
+                np.dot(a, b, out=out)
+        
+        # One worker per logical core; the first one also measures the clock.
+        # Each dot() must stay on its worker's thread, or the multithreaded
+        # BLAS would start a thread per core for every worker
+        workers = [threading.Thread(target=worker, args=(index == 0,), daemon=True)
+                   for index in range(psutil.cpu_count(logical=True) or 1)]
+        with threadpool_limits(limits=1, user_api='blas'):
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
     
-    def _baseline_ai_benchmarking(self) -> Dict[str, Any]:
+    def _measure_sustained_ghz(self, kernel: Callable[[], Any], window: float = 1.0) -> Optional[float]:
+        """Effective clock (GHz) of the calling thread while it runs kernel for ~window seconds"""
+        counters = PerfCounters.open(['cycles'])
+        if counters is None:
+            # No PMU access: fall back to the OS-reported current frequency
+            import psutil
+            freq = psutil.cpu_freq()
+            return freq.current / 1000.0 if freq and freq.current else None
+        
+        try:
+            counters.start()
+            cpu_start = time.thread_time()
+            while time.thread_time() - cpu_start < window:
+                kernel()
+            counters.stop()
+            # Cycles per second of on-CPU time is the frequency the core ran at
+            cpu_time = time.thread_time() - cpu_start
+            return counters.read()['cycles'] / cpu_time / 1e9
+        finally:
+            counters.close()
+    
+    def _baseline_ai_benchmarking(self, ram_gb: float) -> Dict[str, Any]:
         """Stage 3: Baseline AI benchmarking with a small probe model"""
+        from threadpoolctl import threadpool_limits
         benchmark_data = {}
         
         print("Running baseline AI benchmarks...")
@@ -252,66 +631,151 @@ class HardwareProfiler:
         # Simulate AI benchmarking (since we don't have a real model yet)
         # In a real implementation, this would run actual inference tasks
         
-        # Latency test simulation
-        start_time = time.time()
-        # Simulate a simple inference task
-        latency_result = self._simulate_inference_task()
-        latency_time = time.time() - start_time
-        benchmark_data['latency_ms_per_token'] = latency_time * 1000  # Convert to milliseconds
-        
-        # Memory pressure test simulation
-        memory_start = psutil.Process().memory_info().rss
-        memory_result = self._simulate_memory_pressure_task()
-        memory_end = psutil.Process().memory_info().rss
-        benchmark_data['memory_pressure_mb'] = (memory_end - memory_start) / (1024 * 1024)
-        
-        # Parallelism test simulation
-        parallel_start = time.time()
-        # Simulate running AI while UI interaction occurs
-        parallel_result = self._simulate_parallel_task()
-        parallel_time = time.time() - parallel_start
-        benchmark_data['parallel_performance'] = parallel_time
+        # Latency test: a decode-shaped kernel wrapped in hardware counters.
+        # Counters follow this thread only, so BLAS is held to this thread
+        # for the probe and its contended re-run; otherwise IPC and hit rates
+        # would cover only the calling thread's share plus BLAS handoff.
+        with threadpool_limits(limits=1, user_api='blas'):
+            weights, state = self._inference_probe_operands()
+            counters = PerfCounters.open(BENCHMARK_COUNTERS)
+            counts = {}
+            try:
+                if counters:
+                    counters.start()
+                start_time = time.time()
+                latency_result = self._simulate_inference_task(weights, state)
+                latency_time = time.time() - start_time
+                if counters:
+                    counters.stop()
+                    counts = counters.read()
+            finally:
+                if counters:
+                    counters.close()
+            
+            # Parallelism test: how much the same probe slows down while other
+            # work (e.g. the UI) competes for cores and caches
+            parallel_performance = self._simulate_parallel_task(weights, state, latency_time)
+        benchmark_data['latency_ms_per_token'] = latency_time * 1000 / latency_result['tokens']
+        benchmark_data.update(self._counter_metrics(counts))
+        benchmark_data['parallel_performance'] = parallel_performance
+        
+        # Memory pressure test simulation, sized from the installed RAM
+        target_bytes = min(512 * 1024 * 1024, int(ram_gb * 1024**3) // 32)
+        rss_growth = self._simulate_memory_pressure_task(target_bytes)
+        benchmark_data['memory_pressure_mb'] = rss_growth / (1024 * 1024)
+        # The buffer size follows installed RAM, so only the RSS growth per
+        # byte touched says anything about the allocator and the OS
+        benchmark_data['memory_overhead_ratio'] = rss_growth / target_bytes if target_bytes else 1.0
         
         benchmark_data['overall_score'] = self._calculate_overall_score(
             benchmark_data['latency_ms_per_token'],
-            benchmark_data['memory_pressure_mb'],
-            benchmark_data['parallel_performance']
+            benchmark_data['memory_overhead_ratio'],
+            benchmark_data['parallel_performance'],
+            benchmark_data['ipc'],
+            benchmark_data['llc_hit_rate']
         )
         
         return benchmark_data
     
-    def _simulate_inference_task(self):
-        """Simulate a simple AI inference task"""
-        # This is a placeholder for actual model inference
-        time.sleep(0.1)  # Simulate processing time
-        return {"result": "simulated_inference", "tokens": 10}
-    
-    def _simulate_memory_pressure_task(self):
-        """Simulate a memory-intensive task"""
-        # Create a large list to increase memory usage
-        large_list = [i for i in range(100000)]
-        time.sleep(0.05)
-        return sum(large_list)  # Use the list to prevent garbage collection
-    
-    def _simulate_parallel_task(self):
-        """Simulate running AI tasks in parallel with UI operations"""
-        # Simulate concurrent operations
-        time.sleep(0.05)
-        return {"parallel_result": "success"}
-    
-    def _calculate_overall_score(self, latency, memory_pressure, parallel_time) -> float:
+    def _inference_probe_operands(self, hidden: int = 2048):
+        """Build the weight matrix (16 MB, larger than most L2s) and state vector for the probe"""
+        import numpy as np
+        # Scaled so repeated products stay bounded instead of overflowing
+        weights = (np.random.rand(hidden, hidden) / hidden).astype(np.float32)
+        state = np.random.rand(hidden).astype(np.float32)
+        return weights, state
+    
+    def _simulate_inference_task(self, weights, state, tokens: int = 32):
+        """Approximate token decoding with one matrix-vector product per token"""
+        import numpy as np
+        # Decoding streams every weight once per token, so this is bound by
+        # the same memory/cache behaviour as real quantized inference
+        out = np.empty_like(state)
+        for _ in range(tokens):
+            np.dot(weights, state, out=out)
+            state, out = out, state
+        return {"result": "simulated_inference", "tokens": tokens}
+    
+    def _counter_metrics(self, counts: Dict[str, int]) -> Dict[str, Optional[float]]:
+        """Derive IPC and L1D/LLC hit rates (percent) from raw counter values"""
+        def ratio(numerator, denominator):
+            if counts.get(numerator) is None or not counts.get(denominator):
+                return None
+            return counts[numerator] / counts[denominator]
+        
+        ipc = ratio('instructions', 'cycles')
+        l1_miss = ratio('l1d_read_misses', 'l1d_read_accesses')
+        llc_miss = ratio('cache_misses', 'cache_references')
+        return {
+            'ipc': ipc,
+            'l1_hit_rate': None if l1_miss is None else 100.0 * (1 - l1_miss),
+            'llc_hit_rate': None if llc_miss is None else 100.0 * (1 - llc_miss),
+        }
+    
+    def _simulate_memory_pressure_task(self, target_bytes: int) -> int:
+        """Allocate and touch target_bytes of memory, returning the RSS growth in bytes"""
+        import numpy as np
+        import psutil
+        process = psutil.Process()
+        memory_start = process.memory_info().rss
+        # fill() faults every page in, so the RSS growth tracks the buffer size
+        # rather than allocator slack
+        buffer = np.empty(target_bytes, dtype=np.uint8)
+        buffer.fill(1)
+        # Measure while the buffer is still alive
+        memory_end = process.memory_info().rss
+        del buffer
+        return max(0, memory_end - memory_start)
+    
+    def _simulate_parallel_task(self, weights, state, solo_time: float) -> float:
+        """
+        Re-run the inference probe alongside a background matmul and return the
+        contended/solo latency ratio (1.0 means no interference)
+        """
+        stop = threading.Event()
+        
+        def timed_probe():
+            start = time.time()
+            self._simulate_inference_task(weights, state)
+            return time.time() - start
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            background = executor.submit(self._background_matmul, stop)
+            probe = executor.submit(timed_probe)
+            try:
+                contended_time = probe.result()
+            finally:
+                stop.set()
+            background.result()
+        
+        return contended_time / solo_time if solo_time > 0 else 1.0
+    
+    def _background_matmul(self, stop: threading.Event) -> None:
+        """Competing workload for the parallelism test: matmul until stopped"""
+        import numpy as np
+        a = np.random.rand(512, 512).astype(np.float32)
+        out = np.empty_like(a)
+        while not stop.is_set():
+            np.dot(a, a, out=out)
+    
+    def _calculate_overall_score(self, latency, memory_ratio, parallel_ratio,
+                                 ipc=None, llc_hit_rate=None) -> float:
         """Calculate an overall performance score"""
-        # Normalize the values to a 0-100 scale
-        # Lower latency = higher score
-        latency_score = max(0, 100 - (latency / 10))  # Assume 1000ms = 0 score
-        # Lower memory pressure = higher score
-        memory_score = max(0, 100 - (memory_pressure / 10))  # Assume 1000MB = 0 score
-        # Lower parallel time = higher score
-        parallel_score = max(0, 100 - (parallel_time * 1000))  # Convert to ms scale
-        
-        # Weighted average
-        overall_score = (latency_score * 0.4) + (memory_score * 0.3) + (parallel_score * 0.3)
-        return min(100, max(0, overall_score))  # Clamp between 0 and 100
+        import numpy as np
+        # Counter-derived features are NaN when the PMU was not readable
+        features = np.array([
+            latency,
+            max(0.0, memory_ratio - 1.0),
+            max(0.0, parallel_ratio - 1.0),
+            1.0 / ipc if ipc else np.nan,
+            100.0 - llc_hit_rate if llc_hit_rate is not None else np.nan,
+        ])
+        scores = np.clip(100 - features * np.array(SCORE_SCALES), 0, 100)
+        
+        # Weighted average over the available features
+        available = ~np.isnan(features)
+        weights = np.array(SCORE_WEIGHTS)[available]
+        return float(scores[available] @ weights / weights.sum())
     
     def _create_capability_vector(self, hardware_data, thermal_data, benchmark_data) -> HardwareCapabilityVector:
         """Create the final capability vector from all collected data"""
@@ -320,43 +784,18 @@ class HardwareProfiler:
             cpu_cores=hardware_data['cpu_cores'],
             cpu_threads=hardware_data['cpu_threads'],
             cpu_speed=hardware_data['cpu_max_freq'],
+            cpu_speed_sustained=thermal_data['cpu_sustained_ghz'],
             ram_gb=hardware_data['ram_gb'],
             gpu_name=hardware_data['gpu_name'],
             gpu_vram_gb=hardware_data['gpu_vram_gb'],
             storage_tier=hardware_data['storage_tier'],
             thermal_profile=thermal_data['thermal_profile'],
-            special_instructions=hardware_data['special_instructions']
+            special_instructions=tuple(hardware_data['special_instructions'])
         )
     
-    def get_recommendations(self, capability_vector: HardwareCapabilityVector) -> Dict[str, str]:
-        """Generate AI model recommendations based on the capability vector"""
-        recommendations = {}
-        
-        # Determine recommended model based on hardware specs
-        if capability_vector.ram_gb >= 32 and capability_vector.gpu_vram_gb and capability_vector.gpu_vram_gb >= 8:
-            recommendations['primary_model'] = 'Qwen2.5-32B (Q8_0)'
-            recommendations['gpu_layers'] = 'All layers'
-            recommendations['strategy'] = 'Power User - Full GPU acceleration'
-        elif capability_vector.ram_gb >= 16 and capability_vector.gpu_vram_gb and capability_vector.gpu_vram_gb >= 4:
-            recommendations['primary_model'] = 'Qwen2.5-7B (Q6_K)'
-            recommendations['gpu_layers'] = '20-30 layers'
-            recommendations['strategy'] = 'Balanced Performance'
-        elif capability_vector.ram_gb >= 8:
-            recommendations['primary_model'] = 'Qwen2.5-1.5B (Q4_K_M)'
-            recommendations['gpu_layers'] = '5-10 layers if GPU available'
-            recommendations['strategy'] = 'Efficient Operation'
-        else:
-            recommendations['primary_model'] = 'Qwen2.5-0.5B (IQ4_XS)'
-            recommendations['gpu_layers'] = 'None (CPU only)'
-            recommendations['strategy'] = 'Minimal Resource Usage'
-        
-        # Generate AI profiles
-        profiles = {
-            'balanced_daily_driver': f"Qwen2.5-7B (Q6_K) for all tasks",
-            'specialist_ensemble': "Multiple smaller models (Coder, Math, General) with automatic routing",
-            'speed_demon': "Tiny model (0.5B) for instant responses, with option for larger models",
-            'power_user_config': "Manual control for advanced users"
-        }
-        recommendations['profiles'] = profiles
-        
-        return recommendations
\ No newline at end of file
+    def get_recommendations(self, capability_vector: HardwareCapabilityVector) -> Mapping[str, Any]:
+        """
+        Generate AI model recommendations based on the capability vector.
+        Results are cached per vector and returned read-only.
+        """
+        return _recommendations_for(capability_vector)
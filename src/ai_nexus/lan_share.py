@@ -0,0 +1,36 @@
+"""
+LAN Model Sharing for SocraTask AI Nexus
+
+Serves downloaded models to other SocraTask hosts on the local network, so a
+model only has to come from the internet once per network. Kept apart from
+the model manager so http.server is only imported when sharing is enabled.
+"""
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+class ModelShareHandler(SimpleHTTPRequestHandler):
+    """Serves the .gguf files at the top level of the models directory, nothing else"""
+    
+    def send_head(self):
+        # Check the path as it will be opened, i.e. after percent-decoding,
+        # so that "/.hub%2Fx.gguf" cannot reach into subdirectories
+        path = Path(self.translate_path(self.path))
+        if path.parent != Path(self.directory) or path.suffix != '.gguf':
+            self.send_error(404)
+            return None
+        return super().send_head()
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def start_share_server(models_dir: Path, port: int) -> ThreadingHTTPServer:
+    """Serve models_dir on port from a background thread; stop it with shutdown()"""
+    handler = functools.partial(ModelShareHandler, directory=str(models_dir))
+    server = ThreadingHTTPServer(('', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -4,17 +4,226 @@ Model Manager & Advanced Orchestration for SocraTask AI Nexus
 Manages the Qwen model ecosystem, downloads, configurations, and runtime orchestration.
 Implements the "Bring-Your-Own-Model" paradigm with intelligent recommendations.
 """
+import io
 import os
+import re
+import ast
+import sys
 import json
-import requests
+import mmap
+import tokenize
+import errno
+import logging
+import bisect
 import hashlib
+import functools
+import threading
+from importlib import resources
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Any
+from urllib.parse import quote
+from dataclasses import dataclass, field
+from enum import IntEnum
 from .hardware_profiler import HardwareCapabilityVector
 
+if TYPE_CHECKING:
+    import httpx
+    from http.server import ThreadingHTTPServer
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# XET storage backend: parallel range requests for multi-GB GGUF files.
+# huggingface_hub reads these once at import time.
+os.environ.setdefault('HF_XET_HIGH_PERFORMANCE', '1')
+os.environ.setdefault('HF_XET_NUM_CONCURRENT_RANGE_GETS', '64')
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+
+# Download chunk size; large enough to keep the SHA-256 block pipeline full
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# SHA-256 and BLAKE3 digests are both 32 bytes, i.e. 64 hex characters
+_HEX_DIGEST = re.compile(r'[0-9a-f]{64}')
+
+
+def _sha256_or_none(checksum: str) -> Optional[str]:
+    """The checksum if it is a real SHA-256 hex digest (not a catalog placeholder)"""
+    return checksum if _HEX_DIGEST.fullmatch(checksum) else None
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only copy of nested dicts and lists (as mapping proxies and tuples)"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+# Models downloaded at once by download_models
+MAX_CONCURRENT_DOWNLOADS = 4
+
+# Read size for the O_DIRECT path; a multiple of any logical block size
+DIRECT_IO_CHUNK_SIZE = 16 << 20
+
+
+@functools.lru_cache(maxsize=1)
+def _logical_cpus() -> int:
+    """Logical CPUs this process may run on (respects container CPU sets)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _read_file_direct(path: Path, chunk: int = DIRECT_IO_CHUNK_SIZE) -> Iterator[memoryview]:
+    """
+    Yield a file's contents read with O_DIRECT, bypassing the page cache so
+    verifying a multi-GB model does not evict the rest of the system's
+    working set. Each view is only valid until the next one is requested.
+    Falls back to buffered reads (dropped from the cache afterwards) on
+    filesystems that reject O_DIRECT, such as NFS or older tmpfs.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECT)
+    except OSError as e:
+        if e.errno != errno.EINVAL:
+            raise
+        yield from _read_file_buffered(path, chunk)
+        return
+    
+    # Anonymous mmap is page aligned, which satisfies O_DIRECT alignment
+    buffer = mmap.mmap(-1, chunk)
+    view = memoryview(buffer)
+    try:
+        offset = 0
+        while True:
+            try:
+                n = os.preadv(fd, [buffer], offset)
+            except OSError as e:
+                if e.errno != errno.EINVAL or offset:
+                    raise
+                # Filesystem accepted the flag but not the read itself
+                yield from _read_file_buffered(path, chunk)
+                return
+            if not n:
+                break
+            yield view[:n]
+            offset += n
+    finally:
+        # The buffer is freed with the last view the caller holds
+        os.close(fd)
+
+
+def _read_file_buffered(path: Path, chunk: int) -> Iterator[memoryview]:
+    """Sequential buffered reads that leave nothing behind in the page cache"""
+    buffer = bytearray(chunk)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        fd = f.fileno()
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        try:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                yield view[:n]
+        finally:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+@functools.lru_cache(maxsize=1)
+def _hub():
+    """
+    huggingface_hub, imported on first use so that importing the nexus does
+    not pay for it, or None if it is not installed
+    """
+    try:
+        import huggingface_hub
+        import huggingface_hub.utils
+    except ImportError:
+        return None
+    return huggingface_hub
+
+
+def _hub_progress_class(progress_callback: Callable[[int, str], Any], message: str) -> type:
+    """
+    A huggingface_hub progress bar class that reports whole-percent steps to
+    progress_callback instead of drawing on the terminal
+    """
+    class _HubProgress(_hub().utils.tqdm):
+        reported = 0  # Last percentage passed to the callback, shared by the bars of one download
+        
+        def __init__(self, *args, **kwargs):
+            kwargs['disable'] = True  # Nothing is drawn; update() still counts
+            super().__init__(*args, **kwargs)
+        
+        def update(self, n=1):
+            self.n += n
+            if self.total:
+                progress = min(int(self.n * 100 // self.total), 100)
+                if progress > _HubProgress.reported:
+                    _HubProgress.reported = progress
+                    progress_callback(progress, message)
+    
+    return _HubProgress
+
+
+class SizeClass(IntEnum):
+    """Parameter-count class of a model; MEDIUM and up need GPU offloading"""
+    TINY = 0  # 0.5B
+    SMALL = 1  # 1.5B
+    VL_SMALL = 2  # 2B
+    MEDIUM = 3  # 7B
+    LARGE = 4  # 32B
+
+
+class Family(IntEnum):
+    """Model family, i.e. what the variant is specialized for"""
+    GENERAL = 0
+    CODER = 1
+    MATH = 2
+    VISION = 3
+    AUDIO = 4
+
+
+_SIZE_TO_CLASS = {
+    "0.5B": SizeClass.TINY,
+    "1.5B": SizeClass.SMALL,
+    "2B": SizeClass.VL_SMALL,
+    "7B": SizeClass.MEDIUM,
+    "32B": SizeClass.LARGE,
+}
+
+def _size_class(size: str) -> SizeClass:
+    """
+    Class of a parameter count such as "7B". Sizes without an entry in
+    _SIZE_TO_CLASS (say "14B") take the class of the nearest smaller one.
+    """
+    size_class = _SIZE_TO_CLASS.get(size)
+    if size_class is not None:
+        return size_class
+    try:
+        params = float(size.upper().removesuffix('B'))
+    except ValueError:
+        raise ValueError(f"Unrecognized model size {size!r}") from None
+    known = sorted((float(label[:-1]), cls) for label, cls in _SIZE_TO_CLASS.items())
+    return next((cls for p, cls in reversed(known) if p <= params), SizeClass.TINY)
+
+
+_VARIANT_TO_FAMILY = {
+    "Qwen2.5": Family.GENERAL,
+    "Qwen2.5-Coder": Family.CODER,
+    "Qwen2.5-Math": Family.MATH,
+    "Qwen2.5-VL": Family.VISION,
+    "Qwen2.5-Audio": Family.AUDIO,
+}
+
+
+@dataclass(slots=True, frozen=True)
 class ModelSpec:
     """Specification for a Qwen model"""
     name: str
@@ -26,214 +235,381 @@ class ModelSpec:
     ram_requirement_gb: float
     recommended_hardware: str
     description: str
-    download_url: str
-    checksum: str
+    repo_id: str  # Hugging Face repository, e.g. "Qwen/Qwen2.5-7B-Instruct-GGUF"
+    filename: str  # File name within the repository
+    checksum: str  # SHA-256 as published on Hugging Face
+    size_class: SizeClass = field(init=False, repr=False, compare=False)
+    family_enum: Family = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        family = _VARIANT_TO_FAMILY.get(self.variant)
+        if family is None:
+            raise ValueError(f"Unknown variant {self.variant!r}")
+        object.__setattr__(self, 'size_class', _size_class(self.size))
+        object.__setattr__(self, 'family_enum', family)
+    
+    @property
+    def download_url(self) -> str:
+        return f"https://huggingface.co/{self.repo_id}/resolve/main/{self.filename}"
+
+
+# Context variables an orchestration rule condition may refer to
+RULE_VARIABLES = frozenset({'user_action', 'query_complexity', 'battery', 'task_type'})
+
+_RULE_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Gt, ast.GtE, ast.Lt, ast.LtE, ast.In, ast.NotIn,
+    ast.Name, ast.Load, ast.Constant, ast.Tuple, ast.List,
+)
+
+
+def _normalize_condition(condition: str) -> str:
+    """
+    Rewrite the rule syntax's upper-case AND/OR/NOT and percentages ("50%")
+    as Python, leaving string literals untouched
+    """
+    tokens = []
+    previous = None
+    for token in tokenize.generate_tokens(io.StringIO(condition).readline):
+        if token.type == tokenize.NAME and token.string in ('AND', 'OR', 'NOT'):
+            token = token._replace(string=token.string.lower())
+        elif token.type == tokenize.OP and token.string == '%' and previous is not None \
+                and previous.type == tokenize.NUMBER:
+            previous = token
+            continue
+        tokens.append(token)
+        previous = token
+    return tokenize.untokenize(tokens)
+
+
+def _compile_condition(condition: str) -> Callable[[Mapping[str, Any]], bool]:
+    """
+    Compile a rule condition such as "query_complexity == 'high' AND battery > 50%"
+    into a predicate over a task context. Only comparisons and boolean logic
+    over RULE_VARIABLES are accepted. If any variable the condition refers to
+    is missing from the context (or None), the predicate is false, whatever
+    the order of the operands.
+    """
+    try:
+        tree = ast.parse(_normalize_condition(condition), mode='eval')
+    except (SyntaxError, tokenize.TokenError) as e:
+        msg = e.msg if isinstance(e, SyntaxError) else e.args[0]
+        raise ValueError(f"Invalid rule condition {condition!r}: {msg}") from None
+    for node in ast.walk(tree):
+        if not isinstance(node, _RULE_NODES):
+            raise ValueError(f"Unsupported syntax in rule condition {condition!r}: {type(node).__name__}")
+        if isinstance(node, ast.Name) and node.id not in RULE_VARIABLES:
+            raise ValueError(f"Unknown variable {node.id!r} in rule condition {condition!r}")
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            # Context values such as user_action come from a small closed set
+            node.value = sys.intern(node.value)
+    
+    code = compile(tree, '<rule>', 'eval')
+    names = tuple({node.id for node in ast.walk(tree) if isinstance(node, ast.Name)})
+    
+    def predicate(context: Mapping[str, Any]) -> bool:
+        if any(context.get(name) is None for name in names):
+            return False
+        try:
+            return bool(eval(code, {'__builtins__': {}}, context))
+        except TypeError:
+            return False  # e.g. a string battery level compared with a number
+    
+    return predicate
+
+
+@dataclass(slots=True, frozen=True)
+class OrchestrationRule:
+    """A compiled orchestration rule: IF condition THEN use model_name"""
+    id: int
+    condition: str
+    action: str
+    priority: int
+    predicate: Callable[[Mapping[str, Any]], bool] = field(repr=False, compare=False)
+    model_name: str  # Catalog file the action resolves to
 
 
 class ModelManager:
     """Advanced model management and orchestration system"""
     
-    def __init__(self, models_dir: str = "/workspace/models"):
+    def __init__(self, models_dir: str = "/workspace/models", use_direct_io: bool = True,
+                 lan_share: bool = False, lan_port: int = 8765, lan_peers: Iterable[str] = ()):
         self.models_dir = Path(models_dir)
+        # Hash large files with O_DIRECT reads on Linux (see _read_file_direct)
+        self.use_direct_io = use_direct_io and sys.platform == "linux" and hasattr(os, 'O_DIRECT')
         self.models_dir.mkdir(exist_ok=True)
-        self.downloaded_models: List[ModelSpec] = []
+        # Installed models persist across runs in a SQLite index next to the files
+        import sqlite3
+        self._db = sqlite3.connect(self.models_dir / "index.sqlite", isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS installed(name TEXT PRIMARY KEY, size INT, sha256 TEXT, mtime REAL, blake3 TEXT)"
+        )
+        # Indexes written before BLAKE3 digests were recorded
+        if 'blake3' not in {column for _, column, *_ in self._db.execute("PRAGMA table_info(installed)")}:
+            self._db.execute("ALTER TABLE installed ADD COLUMN blake3 TEXT")
+        self._downloaded_view: Optional[Tuple[ModelSpec, ...]] = None  # Rebuilt after each index change
+        self._index_lock = threading.Lock()  # Downloads update the index from worker threads
         self.active_models: Dict[str, Any] = {}  # Currently loaded models
-        self.model_catalog = self._initialize_model_catalog()
-        self.orchestration_rules = []
-        
-    def _initialize_model_catalog(self) -> List[ModelSpec]:
-        """Initialize the local catalog of available Qwen models"""
-        # This would normally load from a JSON file, but we'll create a representative catalog
-        catalog = [
-            # Qwen2.5 General Models
-            ModelSpec(
-                name="qwen2.5-0.5b-q4_k_m.gguf",
-                family="Qwen2.5",
-                size="0.5B",
-                variant="Qwen2.5",
-                quantization="Q4_K_M",
-                disk_size_gb=0.3,
-                ram_requirement_gb=0.5,
-                recommended_hardware="8GB+ RAM",
-                description="General purpose model, efficient quantization",
-                download_url="https://huggingface.co/Qwen/Qwen2.5-0.5B-Instruct-GGUF/resolve/main/qwen2.5-0.5b-instruct-q4_k_m.gguf",
-                checksum="checksum_placeholder_0.5b_q4"
-            ),
-            ModelSpec(
-                name="qwen2.5-1.5b-q4_k_m.gguf",
-                family="Qwen2.5",
-                size="1.5B",
-                variant="Qwen2.5",
-                quantization="Q4_K_M",
-                disk_size_gb=0.9,
-                ram_requirement_gb=1.2,
-                recommended_hardware="8GB+ RAM",
-                description="General purpose model with good capabilities",
-                download_url="https://huggingface.co/Qwen/Qwen2.5-1.5B-Instruct-GGUF/resolve/main/qwen2.5-1.5b-instruct-q4_k_m.gguf",
-                checksum="checksum_placeholder_1.5b_q4"
-            ),
-            ModelSpec(
-                name="qwen2.5-7b-q6_k.gguf",
-                family="Qwen2.5",
-                size="7B",
-                variant="Qwen2.5",
-                quantization="Q6_K",
-                disk_size_gb=5.2,
-                ram_requirement_gb=6.5,
-                recommended_hardware="16GB+ RAM, 4GB+ VRAM recommended",
-                description="Balanced general purpose model",
-                download_url="https://huggingface.co/Qwen/Qwen2.5-7B-Instruct-GGUF/resolve/main/qwen2.5-7b-instruct-q6_k.gguf",
-                checksum="checksum_placeholder_7b_q6"
-            ),
-            ModelSpec(
-                name="qwen2.5-32b-q8_0.gguf",
-                family="Qwen2.5",
-                size="32B",
-                variant="Qwen2.5",
-                quantization="Q8_0",
-                disk_size_gb=24.0,
-                ram_requirement_gb=32.0,
-                recommended_hardware="32GB+ RAM, 8GB+ VRAM recommended",
-                description="High capability general purpose model",
-                download_url="https://huggingface.co/Qwen/Qwen2.5-32B-Instruct-GGUF/resolve/main/qwen2.5-32b-instruct-q8_0.gguf",
-                checksum="checksum_placeholder_32b_q8"
-            ),
-            
-            # Qwen2.5 Coder Models
-            ModelSpec(
-                name="qwen2.5-coder-1.5b-q4_k_m.gguf",
-                family="Qwen2.5-Coder",
-                size="1.5B",
-                variant="Qwen2.5-Coder",
-                quantization="Q4_K_M",
-                disk_size_gb=0.9,
-                ram_requirement_gb=1.2,
-                recommended_hardware="8GB+ RAM",
-                description="Specialized for code generation and debugging",
-                download_url="https://huggingface.co/Qwen/Qwen2.5-Coder-1.5B-Instruct-GGUF/resolve/main/qwen2.5-coder-1.5b-instruct-q4_k_m.gguf",
-                checksum="checksum_placeholder_coder_1.5b_q4"
-            ),
-            ModelSpec(
-                name="qwen2.5-coder-7b-q6_k.gguf",
-                family="Qwen2.5-Coder",
-                size="7B",
-                variant="Qwen2.5-Coder",
-                quantization="Q6_K",
-                disk_size_gb=5.2,
-                ram_requirement_gb=6.5,
-                recommended_hardware="16GB+ RAM, 4GB+ VRAM recommended",
-                description="Advanced code generation and debugging model",
-                download_url="https://huggingface.co/Qwen/Qwen2.5-Coder-7B-Instruct-GGUF/resolve/main/qwen2.5-coder-7b-instruct-q6_k.gguf",
-                checksum="checksum_placeholder_coder_7b_q6"
-            ),
-            
-            # Qwen2.5 Math Models
-            ModelSpec(
-                name="qwen2.5-math-1.5b-q4_k_m.gguf",
-                family="Qwen2.5-Math",
-                size="1.5B",
-                variant="Qwen2.5-Math",
-                quantization="Q4_K_M",
-                disk_size_gb=0.9,
-                ram_requirement_gb=1.2,
-                recommended_hardware="8GB+ RAM",
-                description="Specialized for mathematical reasoning",
-                download_url="https://huggingface.co/Qwen/Qwen2.5-Math-1.5B-Instruct-GGUF/resolve/main/qwen2.5-math-1.5b-instruct-q4_k_m.gguf",
-                checksum="checksum_placeholder_math_1.5b_q4"
-            ),
-            ModelSpec(
-                name="qwen2.5-math-7b-q6_k.gguf",
-                family="Qwen2.5-Math",
-                size="7B",
-                variant="Qwen2.5-Math",
-                quantization="Q6_K",
-                disk_size_gb=5.2,
-                ram_requirement_gb=6.5,
-                recommended_hardware="16GB+ RAM, 4GB+ VRAM recommended",
-                description="Advanced mathematical reasoning model",
-                download_url="https://huggingface.co/Qwen/Qwen2.5-Math-7B-Instruct-GGUF/resolve/main/qwen2.5-math-7b-instruct-q6_k.gguf",
-                checksum="checksum_placeholder_math_7b_q6"
-            ),
-            
-            # Qwen2.5 Vision Language Models
-            ModelSpec(
-                name="qwen2.5-vl-2b-q4_k_m.gguf",
-                family="Qwen2.5-VL",
-                size="2B",
-                variant="Qwen2.5-VL",
-                quantization="Q4_K_M",
-                disk_size_gb=1.5,
-                ram_requirement_gb=2.0,
-                recommended_hardware="8GB+ RAM, 4GB+ VRAM recommended",
-                description="Vision-language model for image analysis",
-                download_url="https://huggingface.co/Qwen/Qwen2.5-VL-2B-Instruct-GGUF/resolve/main/qwen2.5-vl-2b-instruct-q4_k_m.gguf",
-                checksum="checksum_placeholder_vl_2b_q4"
-            ),
-        ]
-        
-        return catalog
-    
-    def get_model_recommendations(self, capability_vector: HardwareCapabilityVector) -> Dict[str, Any]:
-        """Generate model recommendations based on hardware capability vector"""
+        # Read-only recommendations per capability vector seen
+        self._recommendations: Dict[HardwareCapabilityVector, Mapping[str, Any]] = {}
+        self.orchestration_rules: List[OrchestrationRule] = []  # Highest priority first
+        self.rules_version = 0  # Bumped on every rule change
+        # Parallel columns in the same order, so matching scans only predicates
+        self._rule_keys: List[Tuple[int, int]] = []  # (-priority, id)
+        self._rule_predicates: List[Callable[[Mapping[str, Any]], bool]] = []
+        self._rule_models: List[str] = []
+        # Other SocraTask hosts ("host:port") tried before the internet
+        self.lan_peers = tuple(lan_peers)
+        self._share_server: Optional['ThreadingHTTPServer'] = None
+        if lan_share:
+            self._start_lan_share(lan_port)
+    
+    def __enter__(self) -> 'ModelManager':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Close pooled HTTP connections and the index, and stop sharing models on the LAN"""
+        http = self.__dict__.pop('_http', None)
+        if http is not None:
+            http.close()
+        if self._share_server is not None:
+            self._share_server.shutdown()
+            self._share_server.server_close()
+            self._share_server = None
+        self._db.close()
+    
+    def _start_lan_share(self, port: int) -> None:
+        """Serve downloaded models to LAN peers from a background thread"""
+        from .lan_share import start_share_server
+        self._share_server = start_share_server(self.models_dir, port)
+        logger.info("Sharing models in %s on port %d", self.models_dir, port)
+    
+    @functools.cached_property
+    def _http(self) -> 'httpx.Client':
+        import httpx
+        # One HTTP/2 client for all downloads so connections and TLS sessions are reused
+        return httpx.Client(
+            http2=True,
+            follow_redirects=True,  # huggingface.co redirects file downloads to its CDN
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_keepalive_connections=8),
+        )
+    
+    @functools.cached_property
+    def model_catalog(self) -> Tuple[ModelSpec, ...]:
+        """The catalog of available Qwen models, loaded from data/catalog.json on first use"""
+        raw = resources.files(__package__).joinpath("data").joinpath("catalog.json").read_text(encoding="utf-8")
+        catalog = []
+        for entry in json.loads(raw):
+            try:
+                # Share the strings that repeat across entries (families, quantizations, ...)
+                catalog.append(ModelSpec(**{k: sys.intern(v) if isinstance(v, str) else v
+                                            for k, v in entry.items()}))
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Invalid catalog entry {entry.get('name', entry)!r}: {e}") from None
+        return tuple(catalog)
+    
+    @property
+    def downloaded_models(self) -> Tuple[ModelSpec, ...]:
+        """Installed catalog models recorded in the index, as an immutable snapshot"""
+        with self._index_lock:
+            if self._downloaded_view is None:
+                rows = self._db.execute("SELECT name FROM installed ORDER BY rowid").fetchall()
+                self._downloaded_view = tuple(self._by_name[name] for name, in rows if name in self._by_name)
+            return self._downloaded_view
+    
+    def _add_downloaded(self, model_spec: ModelSpec, sha256: Optional[str], blake3_digest: Optional[str] = None) -> None:
+        """Record a verified model file, and its digests if known, in the index"""
+        stat = (self.models_dir / model_spec.name).stat()
+        with self._index_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO installed(name, size, sha256, mtime, blake3) VALUES (?, ?, ?, ?, ?)",
+                (model_spec.name, stat.st_size, sha256, stat.st_mtime, blake3_digest),
+            )
+            self._downloaded_view = None
+    
+    def _indexed_blake3(self, model_name: str) -> Optional[str]:
+        """BLAKE3 digest recorded when the model was last verified, if any"""
+        with self._index_lock:
+            row = self._db.execute("SELECT blake3 FROM installed WHERE name = ?", (model_name,)).fetchone()
+        return row[0] if row else None
+    
+    def _is_indexed(self, model_path: Path) -> bool:
+        """Whether the file is unchanged since it was verified and indexed"""
+        try:
+            stat = model_path.stat()
+        except FileNotFoundError:
+            return False
+        with self._index_lock:
+            row = self._db.execute(
+                "SELECT size, mtime FROM installed WHERE name = ?", (model_path.name,)
+            ).fetchone()
+        return row is not None and row == (stat.st_size, stat.st_mtime)
+    
+    def rescan(self) -> None:
+        """
+        Reconcile the index with the models directory in one pass: drop entries
+        whose file is gone or has changed, and index catalog models found on
+        disk once their checksum verifies.
+        """
+        on_disk = {
+            entry.name: entry.stat()
+            for entry in os.scandir(self.models_dir)
+            if entry.is_file() and entry.name in self._by_name
+        }
+        with self._index_lock:
+            indexed = {name: (size, mtime, digest) for name, size, mtime, digest in
+                       self._db.execute("SELECT name, size, mtime, blake3 FROM installed")}
+            stale = [(name,) for name, (size, mtime, _) in indexed.items()
+                     if name not in on_disk or (on_disk[name].st_size, on_disk[name].st_mtime) != (size, mtime)]
+            self._db.executemany("DELETE FROM installed WHERE name = ?", stale)
+            self._downloaded_view = None
+        
+        stale_names = {name for name, in stale}
+        for name in on_disk:
+            if name in indexed and name not in stale_names:
+                continue
+            spec = self._by_name[name]
+            # Changed files are re-checked against the digest recorded for them
+            self._verify_and_index(spec, spec.checksum, indexed.get(name, (None, None, None))[2])
+    
+    @functools.cached_property
+    def _by_name(self) -> Dict[str, ModelSpec]:
+        # The catalog is fixed once loaded, so index it once
+        return {m.name: m for m in self.model_catalog}
+    
+    @functools.cached_property
+    def _suitability_table(self) -> Tuple[List[float], List[float], Dict[Tuple[int, int], Tuple[ModelSpec, ...]]]:
+        """
+        Suitable models, best first, for every (RAM, VRAM) bucket. Suitability
+        only changes where RAM reaches a model's requirement or VRAM reaches a
+        large model's offload threshold, so with those values as bucket edges
+        the table is exact.
+        """
+        import numpy as np
+        catalog = self.model_catalog
+        ram = np.array([m.ram_requirement_gb for m in catalog], dtype=np.float64)
+        large = np.array([m.size_class >= SizeClass.MEDIUM for m in catalog], dtype=bool)
+        offload = ram * 0.7  # Approximate GPU offloading
+        ram_edges = sorted(set(ram.tolist()))
+        vram_edges = sorted(set(offload[large].tolist()))
+        
+        # Bucket 0 lies below every edge; having no GPU is VRAM bucket 0
+        table = {}
+        for i, ram_gb in enumerate([-np.inf] + ram_edges):
+            for j, vram_gb in enumerate([-np.inf] + vram_edges):
+                # Smaller models must fit in CPU RAM; larger ones also need a GPU for offloading
+                candidates = np.flatnonzero((ram <= ram_gb) & (~large | (offload <= vram_gb)))
+                # Sort by relevance to hardware (largest first, catalog order on ties)
+                order = candidates[np.argsort(-ram[candidates], kind='stable')]
+                table[i, j] = tuple(catalog[k] for k in order)
+        return ram_edges, vram_edges, table
+    
+    def get_model_recommendations(self, capability_vector: HardwareCapabilityVector) -> Mapping[str, Any]:
+        """
+        Generate model recommendations based on hardware capability vector.
+        Results are cached per vector and returned read-only.
+        """
+        recommendations = self._recommendations.get(capability_vector)
+        if recommendations is None:
+            recommendations = self._compute_recommendations(capability_vector)
+            self._recommendations[capability_vector] = recommendations
+        return recommendations
+    
+    def _compute_recommendations(self, capability_vector: HardwareCapabilityVector) -> Mapping[str, Any]:
         recommendations = {
             'primary_model': None,
             'alternative_models': [],
             'profiles': {}
         }
         
-        # Filter models based on hardware capabilities
-        suitable_models = []
-        for model in self.model_catalog:
-            # Check RAM requirements
-            if model.ram_requirement_gb <= capability_vector.ram_gb:
-                # If GPU is available, consider VRAM requirements for larger models
-                if capability_vector.gpu_vram_gb and model.size in ["7B", "32B"]:
-                    if model.ram_requirement_gb * 0.7 <= capability_vector.gpu_vram_gb:  # Approximate GPU offloading
-                        suitable_models.append(model)
-                elif model.size not in ["7B", "32B"]:  # Smaller models that fit in CPU RAM
-                    suitable_models.append(model)
-        
-        # Sort by relevance to hardware
-        suitable_models.sort(key=lambda m: m.ram_requirement_gb, reverse=True)
+        suitable_models = self._suitable_models(capability_vector)
         
         if suitable_models:
             recommendations['primary_model'] = suitable_models[0]
-            recommendations['alternative_models'] = suitable_models[1:4]  # Top 3 alternatives
+            recommendations['alternative_models'] = tuple(suitable_models[1:4])  # Top 3 alternatives
             
             # Generate AI profiles based on hardware
             profiles = self._generate_ai_profiles(capability_vector, suitable_models)
-            recommendations['profiles'] = profiles
+            recommendations['profiles'] = _freeze(profiles)
         
-        return recommendations
+        return MappingProxyType(recommendations)
     
-    def _generate_ai_profiles(self, capability_vector: HardwareCapabilityVector, suitable_models: List[ModelSpec]) -> Dict[str, Any]:
-        """Generate the 4 AI profiles as described in the spec"""
-        profiles = {}
+    def _suitable_models(self, capability_vector: HardwareCapabilityVector) -> Tuple[ModelSpec, ...]:
+        """Models that fit the hardware, best first"""
+        ram_edges, vram_edges, table = self._suitability_table
+        vram = capability_vector.gpu_vram_gb
+        ram_bucket = bisect.bisect_right(ram_edges, capability_vector.ram_gb)
+        vram_bucket = bisect.bisect_right(vram_edges, vram) if vram else 0
+        return table[ram_bucket, vram_bucket]
+    
+    def setup_from_capabilities(self, capability_vector: HardwareCapabilityVector, trust_store: Any,
+                                progress_callback=None) -> Tuple[Optional[ModelSpec], Optional[Dict[str, Any]]]:
+        """
+        Pick the primary model and the Balanced Daily Driver profile for the
+        hardware, trusting the primary model, without building the full
+        recommendations. Returns (None, None) if no model fits.
+        """
+        suitable_models = self._suitable_models(capability_vector)
+        if not suitable_models:
+            return None, None
         
-        # Find appropriate models for each profile
-        tiny_model = next((m for m in suitable_models if m.size == "0.5B"), 
-                         next((m for m in suitable_models if "0.5" in m.size), suitable_models[0] if suitable_models else None))
-        small_model = next((m for m in suitable_models if m.size == "1.5B"), 
-                          next((m for m in suitable_models if "1.5" in m.size), tiny_model))
-        medium_model = next((m for m in suitable_models if m.size == "7B"), 
-                           next((m for m in suitable_models if "7" in m.size), small_model))
+        primary_model = suitable_models[0]
+        trust_store.add(primary_model.name)
         
-        # Profile 1: Balanced Daily Driver
-        profiles['balanced_daily_driver'] = {
+        # The balanced profile runs the largest model of at most medium size
+        balanced_model = next(
+            (m for size in (SizeClass.MEDIUM, SizeClass.SMALL, SizeClass.TINY)
+             for m in suitable_models if m.size_class == size),
+            primary_model
+        )
+        profile = self._balanced_profile(capability_vector, balanced_model)
+        
+        if progress_callback:
+            progress_callback(100, "Configuration complete")
+        return primary_model, profile
+    
+    def _balanced_profile(self, capability_vector: HardwareCapabilityVector, model: ModelSpec) -> Dict[str, Any]:
+        return {
             'name': 'Balanced Daily Driver',
             'description': 'A single capable model for all tasks',
-            'recommended_model': medium_model.name if medium_model else small_model.name,
+            'recommended_model': model.name,
             'configuration': {
                 'context_window': 4096,
                 'gpu_layers': 20 if capability_vector.gpu_vram_gb and capability_vector.gpu_vram_gb >= 4 else 0,
                 'threads': capability_vector.cpu_cores
             }
         }
+    
+    def _generate_ai_profiles(self, capability_vector: HardwareCapabilityVector, suitable_models: List[ModelSpec]) -> Dict[str, Any]:
+        """Generate the 4 AI profiles as described in the spec"""
+        profiles = {}
+        
+        # First (largest) suitable model of each size and variant
+        size_map: Dict[SizeClass, ModelSpec] = {}
+        family_map: Dict[Family, ModelSpec] = {}
+        for m in suitable_models:
+            size_map.setdefault(m.size_class, m)
+            family_map.setdefault(m.family_enum, m)
+        
+        # Find appropriate models for each profile
+        tiny_model = size_map.get(SizeClass.TINY, suitable_models[0] if suitable_models else None)
+        small_model = size_map.get(SizeClass.SMALL, tiny_model)
+        medium_model = size_map.get(SizeClass.MEDIUM, small_model)
+        
+        # Profile 1: Balanced Daily Driver
+        profiles['balanced_daily_driver'] = self._balanced_profile(
+            capability_vector, medium_model if medium_model else small_model
+        )
         
         # Profile 2: Specialist Ensemble
-        coder_model = next((m for m in suitable_models if "Coder" in m.variant), small_model)
-        math_model = next((m for m in suitable_models if "Math" in m.variant), small_model)
-        general_model = next((m for m in suitable_models if "Qwen2.5" == m.variant), small_model)
+        coder_model = family_map.get(Family.CODER, small_model)
+        math_model = family_map.get(Family.MATH, small_model)
+        general_model = family_map.get(Family.GENERAL, small_model)
         
         profiles['specialist_ensemble'] = {
             'name': 'Specialist Ensemble',
@@ -284,77 +660,268 @@ class ModelManager:
     
     def download_model(self, model_name: str, progress_callback=None) -> bool:
         """Download a model from the catalog with validation"""
-        model_spec = next((m for m in self.model_catalog if m.name == model_name), None)
+        model_spec = self._by_name.get(model_name)
         if not model_spec:
-            print(f"Model {model_name} not found in catalog")
+            logger.warning("Model %s not found in catalog", model_name)
             return False
         
         model_path = self.models_dir / model_name
         
+        # Files verified earlier are trusted while their size and mtime are unchanged
+        if self._is_indexed(model_path):
+            logger.info("Model %s already installed at %s", model_name, model_path)
+            return True
+        
         # Check if model already exists
         if model_path.exists():
-            print(f"Model {model_name} already exists at {model_path}")
+            logger.info("Model %s already exists at %s", model_name, model_path)
             # Verify checksum
-            if self._verify_model_checksum(model_path, model_spec.checksum):
-                print(f"Checksum verified for {model_name}")
+            if self._verify_and_index(model_spec, model_spec.checksum, self._indexed_blake3(model_name)):
+                logger.info("Checksum verified for %s", model_name)
                 return True
             else:
-                print(f"Checksum mismatch for {model_name}, re-downloading...")
+                logger.warning("Checksum mismatch for %s, re-downloading...", model_name)
+        
+        # Peers on the local network are much closer than huggingface.co
+        if self.lan_peers and self._download_from_peers(model_spec, model_path, progress_callback):
+            return True
+        
+        if _hub() is not None:
+            return self._download_from_hub(model_spec, model_path, progress_callback)
         
         # Download the model
         try:
-            print(f"Downloading {model_name} from {model_spec.download_url}")
+            logger.info("Downloading %s from %s", model_name, model_spec.download_url)
+            digest, blake3_digest = self._stream_to_file(model_spec.download_url, model_path,
+                                                         model_name, progress_callback)
             
-            # Stream download with progress
-            response = requests.get(model_spec.download_url, stream=True)
+            # Verify checksum after download
+            if self._checksum_matches(digest, model_spec.checksum, model_name):
+                logger.info("Successfully downloaded and verified %s", model_name)
+                # Record in the installed-models index
+                self._add_downloaded(model_spec, digest, blake3_digest)
+                return True
+            else:
+                logger.error("Checksum verification failed for %s", model_name)
+                model_path.unlink()  # Remove corrupted file
+                return False
+                
+        except Exception as e:
+            logger.error("Error downloading %s: %s", model_name, e)
+            if model_path.exists():
+                model_path.unlink()  # Remove partially downloaded file
+            return False
+    
+    async def download_models_async(self, model_names: Iterable[str], progress_callback=None) -> Dict[str, bool]:
+        """Download several models concurrently; returns success per model name"""
+        import asyncio
+        names = list(dict.fromkeys(model_names))  # Each model once, in order
+        self._warm_up()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+        
+        async def worker(name: str) -> bool:
+            async with semaphore:
+                return await asyncio.to_thread(self.download_model, name, progress_callback)
+        
+        results = await asyncio.gather(*(worker(name) for name in names), return_exceptions=True)
+        return {name: result is True for name, result in zip(names, results)}
+    
+    def _warm_up(self) -> None:
+        """Build the catalog index and HTTP client before download threads race to create them"""
+        _ = self._by_name
+        _ = self._http
+    
+    def download_models(self, model_names: Iterable[str], progress_callback=None) -> Dict[str, bool]:
+        """Synchronous wrapper around download_models_async"""
+        import asyncio
+        return asyncio.run(self.download_models_async(model_names, progress_callback))
+    
+    def _stream_to_file(self, url: str, model_path: Path, model_name: str,
+                        progress_callback=None) -> Tuple[str, Optional[str]]:
+        """
+        Stream a URL into model_path and return the SHA-256 and, if blake3 is
+        installed, the BLAKE3 digest of the bytes written
+        """
+        # Stream download with progress over the shared connection pool
+        with self._http.stream("GET", url) as response:
             response.raise_for_status()
             
             total_size = int(response.headers.get('content-length', 0))
             downloaded = 0
+            last_progress = -1
+            # Hash while streaming so verification does not re-read the file
+            digest = hashlib.sha256()
+            blake3_hasher = blake3() if blake3 is not None else None
             
             with open(model_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
+                if total_size and hasattr(os, 'posix_fallocate'):
+                    # Reserve the extents up front for contiguous, sequential writes
+                    try:
+                        os.posix_fallocate(f.fileno(), 0, total_size)
+                    except OSError:
+                        pass  # Not supported by this filesystem
+                
+                for chunk in response.iter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
                     if chunk:
                         f.write(chunk)
+                        digest.update(chunk)
+                        if blake3_hasher is not None:
+                            blake3_hasher.update(chunk)
                         downloaded += len(chunk)
                         if total_size and progress_callback:
-                            progress = int(100 * downloaded / total_size)
-                            progress_callback(progress, f"Downloading {model_name}")
+                            # Report whole-percent steps only
+                            progress = downloaded * 100 // total_size
+                            if progress != last_progress:
+                                last_progress = progress
+                                progress_callback(progress, f"Downloading {model_name}")
+        
+        return digest.hexdigest(), blake3_hasher.hexdigest() if blake3_hasher is not None else None
+    
+    def _download_from_peers(self, model_spec: ModelSpec, model_path: Path, progress_callback=None) -> bool:
+        """Fetch a model from a LAN peer, accepted only if it matches the known SHA-256"""
+        import httpx
+        model_name = model_spec.name
+        # Without a trusted digest there is no way to vet a peer's copy
+        expected = self._expected_sha256(model_spec)
+        if not expected:
+            return False
+        
+        for peer in self.lan_peers:
+            try:
+                logger.debug("Trying %s from LAN peer %s", model_name, peer)
+                digest, blake3_digest = self._stream_to_file(f"http://{peer}/{quote(model_name)}", model_path,
+                                                             model_name, progress_callback)
+            except (httpx.HTTPError, OSError):
+                continue
+            if digest == expected:
+                logger.info("Successfully downloaded and verified %s from %s", model_name, peer)
+                self._add_downloaded(model_spec, digest, blake3_digest)
+                return True
+            logger.warning("Checksum mismatch for %s from %s", model_name, peer)
+        
+        if model_path.exists():
+            model_path.unlink()
+        return False
+    
+    def _expected_sha256(self, model_spec: ModelSpec) -> Optional[str]:
+        """SHA-256 from the catalog, else from the Hub's LFS/XET etag, if either is known"""
+        if _HEX_DIGEST.fullmatch(model_spec.checksum):
+            return model_spec.checksum
+        hub = _hub()
+        if hub is None:
+            return None
+        try:
+            metadata = hub.get_hf_file_metadata(hub.hf_hub_url(model_spec.repo_id, model_spec.filename))
+        except Exception:
+            return None
+        etag = (metadata.etag or '').strip('"')
+        return _sha256_or_none(etag)
+    
+    def _download_from_hub(self, model_spec: ModelSpec, model_path: Path, progress_callback=None) -> bool:
+        """Download a model through huggingface_hub (XET, resumable)"""
+        model_name = model_spec.name
+        try:
+            logger.info("Downloading %s from %s", model_name, model_spec.repo_id)
+            progress_bar = None
+            if progress_callback:
+                progress_callback(0, f"Downloading {model_name}")
+                progress_bar = _hub_progress_class(progress_callback, f"Downloading {model_name}")
             
-            # Verify checksum after download
-            if self._verify_model_checksum(model_path, model_spec.checksum):
-                print(f"Successfully downloaded and verified {model_name}")
-                # Add to downloaded models list
-                self.downloaded_models.append(model_spec)
+            # Interrupted downloads resume from the partial file under .hub
+            hub_path = _hub().hf_hub_download(
+                repo_id=model_spec.repo_id,
+                filename=model_spec.filename,
+                local_dir=self.models_dir / ".hub",
+                tqdm_class=progress_bar,
+            )
+            os.replace(hub_path, model_path)
+            
+            # Already-complete files under .hub produce no progress updates
+            if progress_bar is not None and progress_bar.reported < 100:
+                progress_callback(100, f"Downloading {model_name}")
+            
+            expected = self._expected_sha256(model_spec) or model_spec.checksum
+            if self._verify_and_index(model_spec, expected):
+                logger.info("Successfully downloaded and verified %s", model_name)
                 return True
             else:
-                print(f"Checksum verification failed for {model_name}")
+                logger.error("Checksum verification failed for %s", model_name)
                 model_path.unlink()  # Remove corrupted file
                 return False
-                
+        
         except Exception as e:
-            print(f"Error downloading {model_name}: {str(e)}")
+            logger.error("Error downloading %s: %s", model_name, e)
             if model_path.exists():
-                model_path.unlink()  # Remove partially downloaded file
+                model_path.unlink()
             return False
     
-    def _verify_model_checksum(self, model_path: Path, expected_checksum: str) -> bool:
-        """Verify the downloaded model's integrity"""
-        # In a real implementation, this would calculate the actual checksum
-        # For now, we'll just return True as a placeholder
-        print(f"Verifying checksum for {model_path.name}...")
-        return True  # Placeholder
+    def _verify_and_index(self, model_spec: ModelSpec, expected_checksum: str,
+                          indexed_blake3: Optional[str] = None) -> bool:
+        """
+        Verify a model file already on disk and record it in the index. A file
+        verified before is re-checked against the BLAKE3 digest recorded then;
+        otherwise its SHA-256 is checked and its BLAKE3 digest recorded.
+        """
+        model_path = self.models_dir / model_spec.name
+        logger.debug("Verifying checksum for %s", model_spec.name)
+        sha256 = _sha256_or_none(expected_checksum)
+        if blake3 is not None and indexed_blake3:
+            # BLAKE3 tree-hashes the mapped file on all cores
+            hasher = blake3(max_threads=blake3.AUTO)
+            hasher.update_mmap(model_path)
+            blake3_digest = indexed_blake3
+            verified = hasher.hexdigest() == indexed_blake3
+        elif sha256 is None:
+            blake3_digest = None
+            verified = self._checksum_matches(None, expected_checksum, model_spec.name)
+        else:
+            actual, blake3_digest = self._hash_file_streaming(model_path)
+            verified = actual == sha256
+        
+        if verified:
+            self._add_downloaded(model_spec, sha256, blake3_digest)
+        return verified
+    
+    def _hash_file_streaming(self, model_path: Path) -> Tuple[str, Optional[str]]:
+        """
+        SHA-256 and, if blake3 is installed, BLAKE3 of a file in one pass,
+        read with O_DIRECT or from a read-only memory map
+        """
+        digest = hashlib.sha256()
+        blake3_hasher = blake3(max_threads=blake3.AUTO) if blake3 is not None else None
+        if self.use_direct_io:
+            for block in _read_file_direct(model_path):
+                digest.update(block)
+                if blake3_hasher is not None:
+                    blake3_hasher.update(block)
+        else:
+            with open(model_path, 'rb') as f:
+                # mmap cannot map empty files
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        digest.update(mapped)
+                        if blake3_hasher is not None:
+                            blake3_hasher.update(mapped)
+        return digest.hexdigest(), blake3_hasher.hexdigest() if blake3_hasher is not None else None
+    
+    def _checksum_matches(self, actual: Optional[str], expected: str, model_name: str) -> bool:
+        """Compare a SHA-256 hex digest against the catalog checksum"""
+        if not _HEX_DIGEST.fullmatch(expected):
+            # Catalog entries without a published SHA-256 cannot be verified
+            logger.warning("No SHA-256 published for %s, skipping verification", model_name)
+            return True
+        return actual == expected
     
     def load_model(self, model_name: str, config: Dict[str, Any] = None) -> bool:
         """Load a model into memory for inference"""
         model_path = self.models_dir / model_name
         if not model_path.exists():
-            print(f"Model {model_name} not found at {model_path}")
+            logger.warning("Model %s not found at %s", model_name, model_path)
             return False
         
         # In a real implementation, this would load the model using a library like llama-cpp-python
         # For now, we'll just simulate the loading process
-        print(f"Loading model {model_name} with config: {config}")
+        logger.info("Loading model %s with config: %s", model_name, config)
         
         # Store in active models
         self.active_models[model_name] = {
@@ -369,27 +936,72 @@ class ModelManager:
     def unload_model(self, model_name: str) -> bool:
         """Unload a model from memory"""
         if model_name in self.active_models:
-            print(f"Unloading model {model_name}")
+            logger.info("Unloading model %s", model_name)
             del self.active_models[model_name]
             return True
         return False
     
     def add_orchestration_rule(self, condition: str, action: str, priority: int = 1) -> None:
-        """Add a runtime orchestration rule"""
-        rule = {
-            'condition': condition,
-            'action': action,
-            'priority': priority,
-            'id': len(self.orchestration_rules)
-        }
-        self.orchestration_rules.append(rule)
-        print(f"Added orchestration rule: IF {condition} THEN {action}")
+        """
+        Add a runtime orchestration rule. The condition is compiled and the
+        action ("use Qwen2.5-7B") resolved to a catalog model once, here;
+        either raises ValueError if invalid.
+        """
+        rule = OrchestrationRule(
+            id=len(self.orchestration_rules),
+            condition=condition,
+            action=action,
+            priority=priority,
+            predicate=_compile_condition(condition),
+            model_name=self._resolve_rule_action(action),
+        )
+        # Equal priorities keep insertion order
+        key = (-priority, rule.id)
+        index = bisect.bisect_right(self._rule_keys, key)
+        self._rule_keys.insert(index, key)
+        self._rule_predicates.insert(index, rule.predicate)
+        self._rule_models.insert(index, rule.model_name)
+        self.orchestration_rules.insert(index, rule)
+        self.rules_version += 1
+        logger.info("Added orchestration rule: IF %s THEN %s", condition, action)
+    
+    @property
+    def rule_targets(self) -> Tuple[Tuple[Callable[[Mapping[str, Any]], bool], str], ...]:
+        """(predicate, model file) for each rule, highest priority first"""
+        return tuple(zip(self._rule_predicates, self._rule_models))
+    
+    def match_orchestration_rule(self, context: Mapping[str, Any]) -> Optional[str]:
+        """Model file chosen by the highest-priority rule matching the context, if any"""
+        for i, predicate in enumerate(self._rule_predicates):
+            if predicate(context):
+                return self._rule_models[i]
+        return None
+    
+    def _resolve_rule_action(self, action: str) -> str:
+        """Map a rule action such as "use Qwen2.5-Coder-7B" to a catalog file name"""
+        target = action.strip()
+        if target.lower().startswith('use '):
+            target = target[4:].strip()
+        if target in self._by_name:
+            return target
+        model = self._by_label.get(target.lower())
+        if model is None:
+            raise ValueError(f"Rule action {action!r} does not name a catalog model")
+        return model.name
     
-    def get_available_models(self) -> List[ModelSpec]:
+    @functools.cached_property
+    def _by_label(self) -> Dict[str, ModelSpec]:
+        # "qwen2.5-coder-7b" -> first catalog entry of that variant and size
+        labels: Dict[str, ModelSpec] = {}
+        for m in self.model_catalog:
+            labels.setdefault(f"{m.variant}-{m.size}".lower(), m)
+        return labels
+    
+    def get_available_models(self) -> Tuple[ModelSpec, ...]:
         """Get list of all available models in the catalog"""
         return self.model_catalog
     
-    def get_downloaded_models(self) -> List[ModelSpec]:
+    def get_downloaded_models(self) -> Tuple[ModelSpec, ...]:
         """Get list of downloaded models"""
         return self.downloaded_models
     
@@ -399,7 +1011,7 @@ class ModelManager:
     
     def get_model_by_name(self, name: str) -> Optional[ModelSpec]:
         """Get a specific model by name"""
-        return next((m for m in self.model_catalog if m.name == name), None)
+        return self._by_name.get(name)
 
 
 class ModelConfigurationWizard:
@@ -430,27 +1042,19 @@ class ModelConfigurationWizard:
         
         return config
     
+    _CONTEXT_WINDOW = {SizeClass.LARGE: 8192, SizeClass.MEDIUM: 4096}
+    _GPU_LAYERS = {SizeClass.LARGE: 30, SizeClass.MEDIUM: 20}
+    
     def _suggest_context_window(self, model_spec: ModelSpec) -> int:
         """Suggest appropriate context window based on model size and capabilities"""
-        if "32B" in model_spec.size:
-            return 8192
-        elif "7B" in model_spec.size:
-            return 4096
-        else:
-            return 2048
+        return self._CONTEXT_WINDOW.get(model_spec.size_class, 2048)
     
     def _suggest_gpu_layers(self, model_spec: ModelSpec) -> int:
         """Suggest number of GPU layers based on model size and available VRAM"""
         # This would normally check actual GPU capabilities
         # For now, return a reasonable default
-        if "32B" in model_spec.size:
-            return 30
-        elif "7B" in model_spec.size:
-            return 20
-        else:
-            return 5
+        return self._GPU_LAYERS.get(model_spec.size_class, 5)
     
     def _suggest_thread_count(self) -> int:
         """Suggest thread count based on CPU capabilities"""
-        import psutil
-        return min(psutil.cpu_count(logical=True), 16)  # Cap at 16 threads
\ No newline at end of file
+        return min(_logical_cpus(), 16)  # Cap at 16 threads
\ No newline at end of file
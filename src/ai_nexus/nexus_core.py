@@ -6,10 +6,122 @@ model management, and orchestration into a unified local intelligence core.
 """
 import os
 import sys
-from typing import Dict, Any, Optional, Callable
+import logging
+import dataclasses
+import functools
+from enum import IntEnum
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Callable, Mapping
 from .hardware_profiler import HardwareProfiler, HardwareCapabilityVector
 from .model_manager import ModelManager, ModelConfigurationWizard
 
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=2)
+def _privacy_audit(privacy_mode: bool) -> Mapping[str, bool]:
+    """Build the (read-only) privacy audit report for a privacy mode setting"""
+    return MappingProxyType({
+        'network_connections_checked': True,  # Would check active network connections
+        'data_exfiltration_detected': False,  # Would check for unauthorized data transmission
+        'local_processing_confirmed': True,   # Confirms processing happens locally
+        'privacy_settings_intact': privacy_mode
+    })
+
+
+class TaskType(IntEnum):
+    """Task category; when keywords of several categories occur, the lowest value wins"""
+    CODE = 0
+    MATH = 1
+    VISION = 2
+    GENERAL = 3
+    
+    @classmethod
+    def from_str(cls, task_type: str) -> 'TaskType':
+        return _classify_task_type(task_type)
+
+
+TASK_KEYWORDS = {
+    TaskType.CODE: ('code', 'programming'),
+    TaskType.MATH: ('math', 'calculate'),
+    TaskType.VISION: ('image', 'vision'),
+}
+
+# Fallback model per task category when no orchestration rule matches
+TASK_MODELS = {
+    TaskType.CODE: 'qwen2.5-coder-7b-q6_k.gguf',
+    TaskType.MATH: 'qwen2.5-math-7b-q6_k.gguf',
+    TaskType.VISION: 'qwen2.5-vl-2b-q4_k_m.gguf',
+    TaskType.GENERAL: 'qwen2.5-7b-q6_k.gguf',
+}
+
+
+def _build_keyword_trie() -> Dict[str, Any]:
+    """Character trie over the task keywords; the '' key holds a keyword's TaskType"""
+    trie: Dict[str, Any] = {}
+    for task, keywords in TASK_KEYWORDS.items():
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = task
+    return trie
+
+
+_KEYWORD_TRIE = _build_keyword_trie()
+
+
+@functools.lru_cache(maxsize=256)
+def _classify_task_type(task_type: str) -> TaskType:
+    """Classify a free-form task type by the highest-precedence keyword it contains"""
+    text = task_type.lower()
+    best = TaskType.GENERAL
+    for start in range(len(text)):
+        node = _KEYWORD_TRIE.get(text[start])
+        # Most positions miss on the first character
+        i = start + 1
+        while node is not None:
+            task = node.get('')
+            if task is not None and task < best:
+                best = task
+                if best == TaskType.CODE:
+                    return best
+            node = node.get(text[i]) if i < len(text) else None
+            i += 1
+    return best
+
+
+class TrustTrie:
+    """
+    Set of trusted model names stored as a character trie, so lookups of
+    unknown names stop at the first character that matches no trusted name
+    """
+    
+    _END = ''  # Marks the end of a trusted name
+    
+    def __init__(self):
+        self._root: Dict[str, Any] = {}
+        self._size = 0
+    
+    def add(self, name: str) -> None:
+        node = self._root
+        for char in name:
+            node = node.setdefault(char, {})
+        if self._END not in node:
+            node[self._END] = True
+            self._size += 1
+    
+    def __contains__(self, name: str) -> bool:
+        node = self._root
+        for char in name:
+            node = node.get(char)
+            if node is None:
+                return False
+        return self._END in node
+    
+    def __len__(self) -> int:
+        return self._size
+
 
 class QwenNexus:
     """
@@ -23,58 +135,54 @@ class QwenNexus:
         self.config_wizard = ModelConfigurationWizard(self.model_manager)
         self.capability_vector: Optional[HardwareCapabilityVector] = None
         self.initialized = False
+        # Read-only copy of the capability vector for status reports
+        self._capability_snapshot: Optional[Mapping[str, Any]] = None
         
         # Privacy and security settings
         self.privacy_mode = True  # By default, no data leaves the device
-        self.trust_store = set()  # Trusted models
+        self.trust_store = TrustTrie()  # Trusted models
         self.sandboxed_execution = True  # All models run in isolation
         
-    def initialize(self, progress_callback: Optional[Callable] = None) -> bool:
+    def initialize(self, progress_callback: Optional[Callable] = None, redo_diagnostic: bool = False) -> bool:
         """
-        Initialize the AI Nexus with hardware profiling and model recommendations
+        Initialize the AI Nexus with hardware profiling and model recommendations.
+        A cached Performance Blueprint is reused unless redo_diagnostic is True.
         """
-        print("Initializing SocraTask Qwen AI Nexus...")
+        logger.info("Initializing SocraTask Qwen AI Nexus...")
         
         # Step 1: Run hardware diagnostic
-        print("Running hardware diagnostic...")
+        logger.info("Running hardware diagnostic...")
         self.capability_vector = self.hardware_profiler.run_full_diagnostic(
-            progress_callback=progress_callback
+            progress_callback=progress_callback,
+            use_cache=not redo_diagnostic
         )
+        self._capability_snapshot = MappingProxyType(dataclasses.asdict(self.capability_vector))
+        # Full recommendations are built on demand by get_model_recommendations
         
-        # Step 2: Generate model recommendations
-        print("Generating model recommendations...")
-        recommendations = self.model_manager.get_model_recommendations(self.capability_vector)
-        
-        # Step 3: Set up recommended configuration based on hardware
-        print("Setting up recommended configuration...")
-        self._setup_recommended_config(recommendations)
+        # Step 2: Set up recommended configuration based on hardware
+        logger.info("Setting up recommended configuration...")
+        self._setup_recommended_config(progress_callback)
         
-        # Step 4: Add default orchestration rules
-        print("Setting up orchestration rules...")
+        # Step 3: Add default orchestration rules
+        logger.info("Setting up orchestration rules...")
         self._setup_default_orchestration_rules()
         
         # Mark as initialized
         self.initialized = True
-        print("Qwen AI Nexus initialized successfully!")
+        logger.info("Qwen AI Nexus initialized successfully!")
         
         return True
     
-    def _setup_recommended_config(self, recommendations: Dict[str, Any]) -> None:
+    def _setup_recommended_config(self, progress_callback: Optional[Callable] = None) -> None:
         """Set up the recommended configuration based on hardware capabilities"""
-        if recommendations['primary_model']:
-            primary_model = recommendations['primary_model']
-            print(f"Recommended primary model: {primary_model.name}")
-            
-            # Add to trust store
-            self.trust_store.add(primary_model.name)
-            
-            # Suggest using the balanced daily driver profile by default
-            balanced_profile = recommendations['profiles'].get('balanced_daily_driver')
-            if balanced_profile:
-                print(f"Using profile: {balanced_profile['name']}")
-                # Apply the profile configuration
-                config = balanced_profile['configuration']
-                print(f"Profile configuration: {config}")
+        # Trusts the primary model and suggests the balanced daily driver profile
+        primary_model, balanced_profile = self.model_manager.setup_from_capabilities(
+            self.capability_vector, self.trust_store, progress_callback
+        )
+        if primary_model:
+            logger.info("Recommended primary model: %s", primary_model.name)
+            logger.info("Using profile: %s", balanced_profile['name'])
+            logger.info("Profile configuration: %s", balanced_profile['configuration'])
     
     def _setup_default_orchestration_rules(self) -> None:
         """Set up default orchestration rules as described in the specification"""
@@ -99,7 +207,7 @@ class QwenNexus:
         """Get the current hardware capability vector"""
         return self.capability_vector
     
-    def get_model_recommendations(self) -> Dict[str, Any]:
+    def get_model_recommendations(self) -> Mapping[str, Any]:
         """Get current model recommendations based on hardware"""
         if not self.capability_vector:
             return {}
@@ -111,22 +219,20 @@ class QwenNexus:
         profile = recommendations.get('profiles', {}).get(profile_name)
         
         if not profile:
-            print(f"Profile {profile_name} not found")
+            logger.warning("Profile %s not found", profile_name)
             return False
         
-        print(f"Downloading models for profile: {profile_name}")
+        logger.info("Downloading models for profile: %s", profile_name)
         
         if 'recommended_model' in profile:
             model_name = profile['recommended_model']
-            print(f"Downloading recommended model: {model_name}")
+            logger.info("Downloading recommended model: %s", model_name)
             return self.model_manager.download_model(model_name)
         elif 'recommended_models' in profile:
-            success = True
-            for model_name in profile['recommended_models']:
-                print(f"Downloading model: {model_name}")
-                if not self.model_manager.download_model(model_name):
-                    success = False
-            return success
+            # Ensemble members download concurrently
+            logger.info("Downloading models: %s", ', '.join(profile['recommended_models']))
+            results = self.model_manager.download_models(profile['recommended_models'])
+            return all(results.values())
         
         return False
     
@@ -146,32 +252,56 @@ class QwenNexus:
             raise RuntimeError("QwenNexus not initialized. Call initialize() first.")
         
         # Determine which model to use based on task type and orchestration rules
-        model_name = self._select_model_for_task(task_type)
+        model_name = self._select_model_for_task(task_type, context)
         
         # In a real implementation, this would call the actual model inference
         # For now, we'll simulate the execution
-        print(f"Executing task '{task_type}' with model '{model_name}'")
-        print(f"Query: {query}")
+        logger.info("Executing task '%s' with model '%s'", task_type, model_name)
+        logger.info("Query: %s", query)
         
         # Simulate AI response
         response = self._simulate_ai_response(task_type, query, context)
         return response
     
-    def _select_model_for_task(self, task_type: str) -> str:
-        """Select the appropriate model based on task type and orchestration rules"""
-        # In a real implementation, this would use the orchestration rules
-        # to determine the best model for the task
-        
-        # For demonstration, return a model based on task type
-        if 'code' in task_type.lower() or 'programming' in task_type.lower():
-            return 'qwen2.5-coder-7b-q6_k.gguf'
-        elif 'math' in task_type.lower() or 'calculate' in task_type.lower():
-            return 'qwen2.5-math-7b-q6_k.gguf'
-        elif 'image' in task_type.lower() or 'vision' in task_type.lower():
-            return 'qwen2.5-vl-2b-q4_k_m.gguf'
-        else:
-            # Default to a general model
-            return 'qwen2.5-7b-q6_k.gguf'
+    def _select_model_for_task(self, task_type: str, context: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Select the appropriate model based on task type and orchestration rules.
+        The first call compiles a dispatcher specialized to the current rules
+        and binds it over this method; it recompiles itself when rules change.
+        """
+        self._select_model_for_task = self._compile_model_dispatcher()
+        return self._select_model_for_task(task_type, context)
+    
+    def _compile_model_dispatcher(self) -> Callable[..., str]:
+        """Generate a flat if-chain over the current orchestration rules"""
+        targets = self.model_manager.rule_targets
+        namespace = {
+            '_manager': self.model_manager,
+            '_nexus_dict': self.__dict__,
+            '_trampoline': functools.partial(QwenNexus._select_model_for_task, self),
+            '_classify': TaskType.from_str,
+            '_task_models': TASK_MODELS,
+        }
+        lines = [
+            "def _dispatch(task_type, context=None):",
+            f"    if _manager.rules_version != {self.model_manager.rules_version}:",
+            "        _nexus_dict.pop('_select_model_for_task', None)",
+            "        return _trampoline(task_type, context)",
+        ]
+        if targets:
+            # Orchestration rules see the task context plus the task type
+            lines += [
+                "    ctx = dict(context) if context else {}",
+                "    ctx.setdefault('task_type', task_type)",
+            ]
+            for i, (predicate, model_name) in enumerate(targets):
+                namespace[f'_rule{i}'] = predicate
+                lines.append(f"    if _rule{i}(ctx): return {model_name!r}")
+        # No rule matched: pick a model based on task type
+        lines.append("    return _task_models[_classify(task_type)]")
+        
+        exec(compile("\n".join(lines), "<model-dispatcher>", "exec"), namespace)
+        return namespace['_dispatch']
     
     def _simulate_ai_response(self, task_type: str, query: str, context: Optional[Dict[str, Any]]) -> str:
         """Simulate an AI response - in real implementation this would call the actual model"""
@@ -188,26 +318,24 @@ class QwenNexus:
             'initialized': self.initialized,
             'privacy_mode': self.privacy_mode,
             'sandboxed_execution': self.sandboxed_execution,
-            'capability_vector': self.capability_vector.__dict__ if self.capability_vector else None,
+            'capability_vector': self._capability_snapshot,
             'downloaded_models_count': len(self.model_manager.get_downloaded_models()),
             'active_models_count': len(self.model_manager.get_active_models()),
             'orchestration_rules_count': len(self.model_manager.orchestration_rules),
             'trust_store_size': len(self.trust_store)
         }
     
-    def run_privacy_audit(self) -> Dict[str, bool]:
+    def run_privacy_audit(self) -> Mapping[str, bool]:
         """Perform a privacy audit to ensure no data is leaving the device"""
-        audit_results = {
-            'network_connections_checked': True,  # Would check active network connections
-            'data_exfiltration_detected': False,  # Would check for unauthorized data transmission
-            'local_processing_confirmed': True,   # Confirms processing happens locally
-            'privacy_settings_intact': self.privacy_mode
-        }
-        return audit_results
+        # The report only depends on the privacy mode, so repeated UI polls
+        # reuse the cached one
+        return _privacy_audit(self.privacy_mode)
 
 
 # Example usage and testing
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     # Create the Qwen Nexus instance
     nexus = QwenNexus()
     
@@ -0,0 +1,165 @@
+"""
+Hardware Performance Counters for SocraTask AI Nexus
+
+Minimal ctypes binding to Linux perf_event_open(2), used by the hardware
+profiler to read cycle, instruction and cache counters for the calling
+thread without any third-party tooling.
+"""
+import os
+import ctypes
+import struct
+import platform
+from typing import Dict, Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows; PerfCounters.open() returns None there anyway
+    fcntl = None
+
+
+# perf_event_attr.type
+PERF_TYPE_HARDWARE = 0
+PERF_TYPE_HW_CACHE = 3
+
+# perf_event_attr.config for PERF_TYPE_HARDWARE
+PERF_COUNT_HW_CPU_CYCLES = 0
+PERF_COUNT_HW_INSTRUCTIONS = 1
+PERF_COUNT_HW_CACHE_REFERENCES = 2
+PERF_COUNT_HW_CACHE_MISSES = 3
+
+# perf_event_attr.config components for PERF_TYPE_HW_CACHE
+PERF_COUNT_HW_CACHE_L1D = 0
+PERF_COUNT_HW_CACHE_OP_READ = 0
+PERF_COUNT_HW_CACHE_RESULT_ACCESS = 0
+PERF_COUNT_HW_CACHE_RESULT_MISS = 1
+
+
+def _hw_cache_config(cache: int, op: int, result: int) -> int:
+    return cache | (op << 8) | (result << 16)
+
+
+# Counter names accepted by PerfCounters.open, mapped to (type, config)
+EVENTS = {
+    'cycles': (PERF_TYPE_HARDWARE, PERF_COUNT_HW_CPU_CYCLES),
+    'instructions': (PERF_TYPE_HARDWARE, PERF_COUNT_HW_INSTRUCTIONS),
+    'cache_references': (PERF_TYPE_HARDWARE, PERF_COUNT_HW_CACHE_REFERENCES),
+    'cache_misses': (PERF_TYPE_HARDWARE, PERF_COUNT_HW_CACHE_MISSES),
+    'l1d_read_accesses': (PERF_TYPE_HW_CACHE, _hw_cache_config(
+        PERF_COUNT_HW_CACHE_L1D, PERF_COUNT_HW_CACHE_OP_READ, PERF_COUNT_HW_CACHE_RESULT_ACCESS)),
+    'l1d_read_misses': (PERF_TYPE_HW_CACHE, _hw_cache_config(
+        PERF_COUNT_HW_CACHE_L1D, PERF_COUNT_HW_CACHE_OP_READ, PERF_COUNT_HW_CACHE_RESULT_MISS)),
+}
+
+# perf_event_open syscall numbers per architecture
+_SYSCALL_NUMBERS = {
+    'x86_64': 298,
+    'amd64': 298,
+    'i386': 336,
+    'i686': 336,
+    'aarch64': 241,
+    'arm64': 241,
+    'armv7l': 364,
+    'ppc64le': 319,
+    'riscv64': 241,
+    's390x': 331,
+}
+
+# perf_event_attr flag bits
+_FLAG_DISABLED = 1 << 0
+_FLAG_EXCLUDE_KERNEL = 1 << 5
+_FLAG_EXCLUDE_HV = 1 << 6
+
+# read_format: report enabled/running times so multiplexed counts can be scaled
+_FORMAT_TOTAL_TIME_ENABLED = 1 << 0
+_FORMAT_TOTAL_TIME_RUNNING = 1 << 1
+
+# ioctl requests
+_PERF_EVENT_IOC_ENABLE = 0x2400
+_PERF_EVENT_IOC_DISABLE = 0x2401
+_PERF_EVENT_IOC_RESET = 0x2403
+
+
+class _PerfEventAttr(ctypes.Structure):
+    """perf_event_attr truncated to PERF_ATTR_SIZE_VER0 (64 bytes)"""
+    _fields_ = [
+        ('type', ctypes.c_uint32),
+        ('size', ctypes.c_uint32),
+        ('config', ctypes.c_uint64),
+        ('sample_period', ctypes.c_uint64),
+        ('sample_type', ctypes.c_uint64),
+        ('read_format', ctypes.c_uint64),
+        ('flags', ctypes.c_uint64),
+        ('wakeup_events', ctypes.c_uint32),
+        ('bp_type', ctypes.c_uint32),
+        ('config1', ctypes.c_uint64),
+    ]
+
+
+def _perf_event_open(event_type: int, config: int) -> int:
+    """Open a user-space-only counter for the calling thread on any CPU"""
+    attr = _PerfEventAttr()
+    attr.type = event_type
+    attr.size = ctypes.sizeof(_PerfEventAttr)
+    attr.config = config
+    attr.read_format = _FORMAT_TOTAL_TIME_ENABLED | _FORMAT_TOTAL_TIME_RUNNING
+    # Excluding kernel/hypervisor keeps this usable at perf_event_paranoid=2
+    attr.flags = _FLAG_DISABLED | _FLAG_EXCLUDE_KERNEL | _FLAG_EXCLUDE_HV
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    fd = libc.syscall(_SYSCALL_NUMBERS[platform.machine().lower()],
+                      ctypes.byref(attr), 0, -1, -1, 0)
+    if fd < 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+    return fd
+
+
+class PerfCounters:
+    """A set of hardware counters bound to the thread that opened them"""
+
+    def __init__(self, fds: Dict[str, int]):
+        self._fds = fds
+
+    @classmethod
+    def open(cls, events: Iterable[str]) -> Optional['PerfCounters']:
+        """
+        Open whichever of the named counters the PMU supports, or return None
+        if none of them are available
+        """
+        if platform.system() != 'Linux' or platform.machine().lower() not in _SYSCALL_NUMBERS:
+            return None
+        fds = {}
+        for name in events:
+            try:
+                fds[name] = _perf_event_open(*EVENTS[name])
+            except OSError:
+                continue  # e.g. no L1D events on this CPU model
+        return cls(fds) if fds else None
+
+    def start(self) -> None:
+        """Zero and enable all counters"""
+        for fd in self._fds.values():
+            fcntl.ioctl(fd, _PERF_EVENT_IOC_RESET, 0)
+            fcntl.ioctl(fd, _PERF_EVENT_IOC_ENABLE, 0)
+
+    def stop(self) -> None:
+        """Disable all counters, freezing their values"""
+        for fd in self._fds.values():
+            fcntl.ioctl(fd, _PERF_EVENT_IOC_DISABLE, 0)
+
+    def read(self) -> Dict[str, int]:
+        """
+        Read the current counts, scaled up if the kernel multiplexed the PMU.
+        Counters that could not be opened are absent from the result.
+        """
+        counts = {}
+        for name, fd in self._fds.items():
+            value, enabled, running = struct.unpack('QQQ', os.read(fd, 24))
+            counts[name] = int(value * enabled / running) if running else 0
+        return counts
+
+    def close(self) -> None:
+        """Release the counter file descriptors"""
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds = {}
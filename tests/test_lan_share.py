@@ -0,0 +1,46 @@
+"""Tests for the LAN model share server"""
+import http.client
+
+import pytest
+
+from src.ai_nexus.lan_share import start_share_server
+
+
+@pytest.fixture
+def server(tmp_path):
+    (tmp_path / "model.gguf").write_bytes(b"weights")
+    (tmp_path / "notes.txt").write_text("not a model")
+    (tmp_path / ".hub").mkdir()
+    (tmp_path / ".hub" / "x.gguf").write_bytes(b"cached")
+    server = start_share_server(tmp_path, 0)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get(server, path):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        conn.close()
+
+
+def test_serves_top_level_models(server):
+    assert _get(server, "/model.gguf") == (200, b"weights")
+    assert _get(server, "/model.gguf?x=1") == (200, b"weights")
+
+
+@pytest.mark.parametrize("path", [
+    "/notes.txt",
+    "/",
+    "/.hub/x.gguf",
+    "/.hub%2Fx.gguf",
+    "/.hub%2fx.gguf",
+    "/model.gguf%2F..%2F.hub%2Fx.gguf",
+    "/missing.gguf",
+])
+def test_refuses_everything_else(server, path):
+    assert _get(server, path)[0] == 404
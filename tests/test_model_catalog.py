@@ -0,0 +1,49 @@
+"""Tests for loading and validating the model catalog"""
+import json
+import dataclasses
+
+import pytest
+
+from src.ai_nexus import model_manager
+from src.ai_nexus.model_manager import ModelManager, ModelSpec, SizeClass
+
+
+@pytest.fixture
+def spec(tmp_path):
+    with ModelManager(models_dir=str(tmp_path)) as manager:
+        return manager.model_catalog[0]
+
+
+def test_catalog_loads(tmp_path):
+    with ModelManager(models_dir=str(tmp_path)) as manager:
+        assert manager.model_catalog
+        assert all(isinstance(m, ModelSpec) for m in manager.model_catalog)
+
+
+@pytest.mark.parametrize("size, size_class", [
+    ("7B", SizeClass.MEDIUM),
+    ("14B", SizeClass.MEDIUM),
+    ("72B", SizeClass.LARGE),
+    ("3B", SizeClass.VL_SMALL),
+    ("0.1B", SizeClass.TINY),
+])
+def test_unlisted_sizes_take_nearest_smaller_class(spec, size, size_class):
+    assert dataclasses.replace(spec, size=size).size_class == size_class
+
+
+def test_invalid_entries_are_rejected(spec):
+    with pytest.raises(ValueError, match="Unknown variant"):
+        dataclasses.replace(spec, variant='Qwen9')
+    with pytest.raises(ValueError, match="Unrecognized model size"):
+        dataclasses.replace(spec, size='huge')
+
+
+def test_invalid_catalog_entry_is_named(spec, tmp_path, monkeypatch):
+    bad = {f.name: getattr(spec, f.name) for f in dataclasses.fields(spec) if f.init}
+    bad.update(name='bad-model.gguf', variant='Qwen9')
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "catalog.json").write_text(json.dumps([bad]), encoding="utf-8")
+    monkeypatch.setattr(model_manager.resources, "files", lambda package: tmp_path)
+    with ModelManager(models_dir=str(tmp_path / "models")) as manager:
+        with pytest.raises(ValueError, match="bad-model.gguf.*Unknown variant"):
+            manager.model_catalog
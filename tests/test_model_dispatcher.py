@@ -0,0 +1,63 @@
+"""Tests for the generated task-to-model dispatcher"""
+import pytest
+
+from src.ai_nexus.nexus_core import QwenNexus, TASK_MODELS, TaskType
+
+
+@pytest.fixture
+def nexus(tmp_path):
+    nexus = QwenNexus(models_dir=str(tmp_path))
+    yield nexus
+    nexus.model_manager.close()
+
+
+def _model(nexus, action):
+    return nexus.model_manager._resolve_rule_action(action)
+
+
+@pytest.mark.parametrize("task_type, task", [
+    ("code review", TaskType.CODE),
+    ("calculate totals", TaskType.MATH),
+    ("describe this image", TaskType.VISION),
+    ("chat", TaskType.GENERAL),
+])
+def test_falls_back_to_task_models(nexus, task_type, task):
+    assert nexus._select_model_for_task(task_type) == TASK_MODELS[task]
+    nexus._setup_default_orchestration_rules()
+    assert nexus._select_model_for_task(task_type, {'user_action': 'reading'}) == TASK_MODELS[task]
+
+
+def test_higher_priority_rule_wins(nexus):
+    nexus._setup_default_orchestration_rules()
+    context = {'user_action': 'writing_email', 'query_complexity': 'high', 'battery': 80}
+    assert nexus._select_model_for_task("chat", context) == _model(nexus, "use Qwen2.5-32B")
+    context['battery'] = 20
+    assert nexus._select_model_for_task("chat", context) == _model(nexus, "use Qwen2.5-7B")
+
+
+def test_rules_see_task_type_without_mutating_context(nexus):
+    nexus.add_custom_orchestration_rule("task_type == 'triage'", "use Qwen2.5-32B")
+    context = {'battery': 80}
+    assert nexus._select_model_for_task("triage", context) == _model(nexus, "use Qwen2.5-32B")
+    assert context == {'battery': 80}
+
+
+def test_recompiles_after_rule_added_through_nexus(nexus):
+    assert nexus._select_model_for_task("chat", {'user_action': 'debugging_python'}) == TASK_MODELS[TaskType.GENERAL]
+    nexus.add_custom_orchestration_rule("user_action == 'debugging_python'", "use Qwen2.5-Coder-7B")
+    assert nexus._select_model_for_task("chat", {'user_action': 'debugging_python'}) == _model(nexus, "use Qwen2.5-Coder-7B")
+
+
+def test_recompiles_after_rule_added_on_manager(nexus):
+    nexus._setup_default_orchestration_rules()
+    context = {'user_action': 'planning'}
+    assert nexus._select_model_for_task("chat", context) == TASK_MODELS[TaskType.GENERAL]
+    dispatcher = nexus._select_model_for_task
+    
+    nexus.model_manager.add_orchestration_rule("user_action == 'planning'", "use Qwen2.5-32B", priority=3)
+    assert nexus._select_model_for_task("chat", context) == _model(nexus, "use Qwen2.5-32B")
+    recompiled = nexus._select_model_for_task
+    assert recompiled is not dispatcher
+    # Once recompiled, the dispatcher is reused until the rules change again
+    assert nexus._select_model_for_task("chat", {}) == TASK_MODELS[TaskType.GENERAL]
+    assert nexus._select_model_for_task is recompiled
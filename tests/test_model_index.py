@@ -0,0 +1,102 @@
+"""Tests for the SQLite index of installed models"""
+import os
+import hashlib
+import dataclasses
+
+import pytest
+
+from src.ai_nexus.model_manager import ModelManager
+
+CONTENT = b"GGUF" + bytes(range(256)) * 64
+
+
+def _open(models_dir, name=None):
+    """A manager whose catalog checksum for name matches CONTENT"""
+    manager = ModelManager(models_dir=str(models_dir), use_direct_io=False)
+    if name is not None:
+        spec = manager._by_name[name]
+        manager._by_name[name] = dataclasses.replace(spec, checksum=hashlib.sha256(CONTENT).hexdigest())
+    return manager
+
+
+def _indexed_row(manager, name):
+    return manager._db.execute("SELECT size, mtime, sha256, blake3 FROM installed WHERE name = ?", (name,)).fetchone()
+
+
+@pytest.fixture
+def name(tmp_path):
+    with _open(tmp_path) as manager:
+        return manager.model_catalog[0].name
+
+
+@pytest.fixture
+def manager(tmp_path, name):
+    (tmp_path / name).write_bytes(CONTENT)
+    with _open(tmp_path, name) as manager:
+        manager.rescan()
+        yield manager
+
+
+def test_index_persists_across_instances(tmp_path, name, manager):
+    assert [m.name for m in manager.downloaded_models] == [name]
+    manager.close()
+    
+    with _open(tmp_path) as reopened:
+        assert [m.name for m in reopened.downloaded_models] == [name]
+        assert reopened._is_indexed(tmp_path / name)
+        assert _indexed_row(reopened, name)[2] == hashlib.sha256(CONTENT).hexdigest()
+
+
+def test_unverified_files_are_not_indexed(tmp_path, name):
+    (tmp_path / name).write_bytes(CONTENT)
+    with _open(tmp_path) as manager:
+        manager._by_name[name] = dataclasses.replace(manager._by_name[name], checksum="0" * 64)
+        manager.rescan()
+        assert manager.downloaded_models == ()
+
+
+def test_resized_file_is_dropped(tmp_path, name, manager):
+    with open(tmp_path / name, 'ab') as f:
+        f.write(b"tampered")
+    assert not manager._is_indexed(tmp_path / name)
+    manager.rescan()
+    assert manager.downloaded_models == ()
+    assert _indexed_row(manager, name) is None
+
+
+def test_touched_file_is_reverified(tmp_path, name, manager):
+    path = tmp_path / name
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert not manager._is_indexed(path)
+    manager.rescan()
+    assert manager._is_indexed(path)
+    assert _indexed_row(manager, name)[1] == path.stat().st_mtime
+
+
+def test_deleted_file_is_dropped(tmp_path, name, manager):
+    (tmp_path / name).unlink()
+    manager.rescan()
+    assert manager.downloaded_models == ()
+
+
+def test_changed_file_is_rechecked_with_blake3(tmp_path, name, manager, monkeypatch):
+    blake3 = pytest.importorskip("blake3").blake3
+    path = tmp_path / name
+    assert _indexed_row(manager, name)[3] == blake3(CONTENT).hexdigest()
+    
+    def no_sha256(model_path):
+        raise AssertionError("re-check should use the indexed BLAKE3 digest")
+    monkeypatch.setattr(manager, '_hash_file_streaming', no_sha256)
+    
+    # Same content, new mtime: the BLAKE3 digest still matches
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    manager.rescan()
+    assert manager._is_indexed(path)
+    
+    # Same size, different content: the BLAKE3 digest no longer matches
+    path.write_bytes(CONTENT[::-1])
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    manager.rescan()
+    assert manager.downloaded_models == ()
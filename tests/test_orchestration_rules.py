@@ -0,0 +1,76 @@
+"""Tests for orchestration rule compilation and matching"""
+import pytest
+
+from src.ai_nexus.model_manager import ModelManager, _compile_condition
+
+
+@pytest.fixture
+def manager(tmp_path):
+    with ModelManager(models_dir=str(tmp_path)) as manager:
+        yield manager
+
+
+@pytest.mark.parametrize("condition, kind", [
+    ("__import__('os') == 1", "Call"),
+    ("battery.real > 50", "Attribute"),
+    ("battery[0] > 50", "Subscript"),
+    ("battery % 2 == 0", "BinOp"),
+    ("(lambda: battery) == 1", "Lambda"),
+])
+def test_rejects_syntax_outside_allowlist(condition, kind):
+    with pytest.raises(ValueError, match=kind):
+        _compile_condition(condition)
+
+
+def test_rejects_unknown_variables():
+    with pytest.raises(ValueError, match="Unknown variable 'os'"):
+        _compile_condition("os == 'posix'")
+
+
+def test_rejects_invalid_syntax():
+    with pytest.raises(ValueError, match="Invalid rule condition"):
+        _compile_condition("battery >")
+
+
+def test_rule_syntax_keywords_and_percentages():
+    predicate = _compile_condition("query_complexity == 'high' AND NOT battery < 50%")
+    assert predicate({'query_complexity': 'high', 'battery': 80})
+    assert not predicate({'query_complexity': 'high', 'battery': 20})
+    assert not predicate({'query_complexity': 'low', 'battery': 80})
+
+
+def test_string_literals_are_not_rewritten():
+    assert _compile_condition("user_action == 'save AND exit'")({'user_action': 'save AND exit'})
+    assert _compile_condition("query_complexity == '50%'")({'query_complexity': '50%'})
+
+
+@pytest.mark.parametrize("condition", [
+    "battery > 50% OR user_action == 'writing_email'",
+    "user_action == 'writing_email' OR battery > 50%",
+])
+def test_missing_variables_do_not_match(condition):
+    predicate = _compile_condition(condition)
+    assert not predicate({})
+    # Independent of operand order, even where OR would short-circuit
+    assert not predicate({'user_action': 'writing_email'})
+    assert not predicate({'battery': None, 'user_action': 'writing_email'})
+    assert predicate({'user_action': 'writing_email', 'battery': 10})
+    assert predicate({'user_action': 'debugging_python', 'battery': 80})
+
+
+def test_rules_match_in_priority_order(manager):
+    manager.add_orchestration_rule("battery > 10", "use Qwen2.5-7B", priority=1)
+    manager.add_orchestration_rule("battery > 50", "use Qwen2.5-Coder-7B", priority=2)
+    manager.add_orchestration_rule("battery > 10", "use Qwen2.5-Math-7B", priority=1)
+    
+    assert [rule.id for rule in manager.orchestration_rules] == [1, 0, 2]
+    assert manager.match_orchestration_rule({'battery': 80}) == 'qwen2.5-coder-7b-q6_k.gguf'
+    # Equal priorities keep insertion order
+    assert manager.match_orchestration_rule({'battery': 30}) == 'qwen2.5-7b-q6_k.gguf'
+    assert manager.match_orchestration_rule({'battery': 5}) is None
+
+
+def test_rule_actions_must_name_catalog_models(manager):
+    with pytest.raises(ValueError, match="does not name a catalog model"):
+        manager.add_orchestration_rule("battery > 10", "use Qwen9-1T")
+    assert manager.orchestration_rules == []
@@ -0,0 +1,60 @@
+"""Tests for hardware-based model recommendations"""
+import math
+
+import pytest
+
+from src.ai_nexus.hardware_profiler import HardwareCapabilityVector
+from src.ai_nexus.model_manager import ModelManager
+
+
+@pytest.fixture(scope="module")
+def manager(tmp_path_factory):
+    with ModelManager(models_dir=str(tmp_path_factory.mktemp("models"))) as manager:
+        yield manager
+
+
+def _capability_vector(ram_gb, gpu_vram_gb):
+    return HardwareCapabilityVector(
+        architecture='x86_64', cpu_cores=4, cpu_threads=8, cpu_speed=3.0,
+        ram_gb=ram_gb, gpu_vram_gb=gpu_vram_gb,
+    )
+
+
+def _reference_suitable_models(catalog, capability_vector):
+    """The original per-model filter the bucket table replaces"""
+    suitable_models = []
+    for model in catalog:
+        if model.ram_requirement_gb <= capability_vector.ram_gb:
+            if capability_vector.gpu_vram_gb and model.size in ["7B", "32B"]:
+                if model.ram_requirement_gb * 0.7 <= capability_vector.gpu_vram_gb:
+                    suitable_models.append(model)
+            elif model.size not in ["7B", "32B"]:
+                suitable_models.append(model)
+    suitable_models.sort(key=lambda m: m.ram_requirement_gb, reverse=True)
+    return tuple(suitable_models)
+
+
+def _around(values):
+    """Each value and the floats just below and above it"""
+    points = set()
+    for value in values:
+        points.update((math.nextafter(value, -math.inf), value, math.nextafter(value, math.inf)))
+    return points
+
+
+def test_suitability_table_matches_reference_filter(manager):
+    catalog = manager.model_catalog
+    # Every bucket edge from either side, plus a regular grid between them
+    ram_points = _around(m.ram_requirement_gb for m in catalog)
+    vram_points = _around(m.ram_requirement_gb * 0.7 for m in catalog)
+    grid = {step / 4 for step in range(0, 65 * 4)}
+    
+    mismatches = []
+    for ram_gb in sorted(ram_points | grid):
+        for gpu_vram_gb in [None] + sorted(vram_points | grid):
+            capability_vector = _capability_vector(ram_gb, gpu_vram_gb)
+            expected = _reference_suitable_models(catalog, capability_vector)
+            if manager._suitable_models(capability_vector) != expected:
+                mismatches.append((ram_gb, gpu_vram_gb))
+    assert not mismatches
+